@@ -3,29 +3,44 @@
 
 import os
 import logging
-from PyQt6.QtCore import QObject, pyqtSignal, QSettings
+from logging.handlers import MemoryHandler, RotatingFileHandler
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal, QSettings, QTimer
 
-# Import core modules
-from src.core.web_engine import WebEngineManager
-from src.core.tab_manager import TabManager
-from src.core.history import HistoryManager
-from src.core.bookmarks import BookmarksManager
-from src.core.cookies import CookiesManager
-from src.core.downloads import DownloadManager
-from src.utils.file_utils import FileUtils
-from src.core.security import SecurityManager
-from src.core.content_security import ContentSecurityManager
+# Shared by every handler installed on the application logger
+_FORMATTER = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
-# Import plugin modules
-from src.plugins.plugin_loader import PluginLoader
-from src.plugins.plugin_manager import PluginManager
-from src.plugins.hook_registry import HookRegistry
+# User paths, resolved once when the module is loaded
+_HOME_DIR = os.path.expanduser("~")
+_LOG_DIR = os.path.join(_HOME_DIR, ".nebulafusion", "logs")
+_DOWNLOADS_DIR = os.path.join(_HOME_DIR, "Downloads")
 
-# Import theme modules
-from src.themes.theme_manager import ThemeManager
+if not os.path.isdir(_LOG_DIR):
+    os.makedirs(_LOG_DIR, exist_ok=True)
 
-# Import UI modules
-from src.ui.main_window import MainWindow
+
+def _to_bool(value):
+    """Coerce a QSettings value to bool."""
+    if isinstance(value, str):
+        return value.lower() in ["true", "1", "yes"]
+    return bool(value)
+
+
+def _identity(value):
+    """Return a QSettings value unchanged."""
+    return value
+
+
+def _coercer_for(default_value):
+    """Return the function that converts stored values to the default's type."""
+    if isinstance(default_value, bool):
+        return _to_bool
+    if isinstance(default_value, int):
+        return int
+    if isinstance(default_value, float):
+        return float
+    return _identity
 
 
 class Application(QObject):
@@ -39,6 +54,48 @@ class Application(QObject):
     starting = pyqtSignal()
     closing = pyqtSignal()
 
+    # Manager start-up order. Each entry is a layer of attribute names;
+    # managers in the same layer only touch their own files/databases and
+    # run concurrently, while layers run one after another.
+    _INIT_LAYERS = (
+        ("settings_manager",),
+        ("web_engine_manager",),
+        ("tab_manager",),
+        ("cookies_manager",),
+        (
+            "history_manager",
+            "bookmarks_manager",
+            "download_manager",
+            "security_manager",
+            "content_security_manager",
+        ),
+    )
+
+    # Manager shutdown order, using the same layer layout. Only managers
+    # with a cleanup() method are listed; the theme manager, plugin loader,
+    # hook registry and tab manager hold nothing that needs releasing.
+    _CLEANUP_LAYERS = (
+        ("plugin_manager",),
+        ("download_manager",),
+        ("cookies_manager",),
+        (
+            "content_security_manager",
+            "security_manager",
+            "bookmarks_manager",
+            "history_manager",
+        ),
+        ("web_engine_manager",),
+        ("settings_manager",),
+    )
+
+    # Application metadata
+    VERSION = "1.0.0"
+    NAME = "NebulaFusion"
+    DESCRIPTION = "A modern web browser with a robust plugin system."
+    AUTHOR = "NebulaFusion Team"
+    WEBSITE = "https://nebulafusion.example.com"
+    LICENSE = "MIT"
+
     def __init__(self):
         """Initialize the application."""
         super().__init__()
@@ -65,33 +122,56 @@ class Application(QObject):
         # logging as well.
         self.logger.propagate = False
 
+        # Handlers are installed once per process; creating another
+        # Application must not duplicate every log line.
+        if self.logger.handlers:
+            return
+
         # Create console handler
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
-
-        # Create formatter
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        console_handler.setFormatter(formatter)
+        console_handler.setFormatter(_FORMATTER)
 
         # Add handler to logger
         self.logger.addHandler(console_handler)
 
-        # Create log directory
-        log_dir = os.path.expanduser("~/.nebulafusion/logs")
-        os.makedirs(log_dir, exist_ok=True)
-
-        # Create file handler
-        file_handler = logging.FileHandler(os.path.join(log_dir, "nebulafusion.log"))
+        # Create file handler; the file is opened on the first record
+        file_handler = RotatingFileHandler(
+            os.path.join(_LOG_DIR, "nebulafusion.log"),
+            maxBytes=5_000_000,
+            backupCount=3,
+            delay=True,
+        )
         file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(formatter)
+        file_handler.setFormatter(_FORMATTER)
+
+        # Buffer file writes, flushing every 64 records or on WARNING+
+        buffered_handler = MemoryHandler(
+            capacity=64, flushLevel=logging.WARNING, target=file_handler
+        )
+        buffered_handler.setLevel(logging.INFO)
 
         # Add handler to logger
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(buffered_handler)
 
     def _create_managers(self):
         """Create managers."""
+        # Import manager modules here rather than at module level so that
+        # importing this module does not load Qt WebEngine and the UI stack.
+        from src.core.web_engine import WebEngineManager
+        from src.core.tab_manager import TabManager
+        from src.core.history import HistoryManager
+        from src.core.bookmarks import BookmarksManager
+        from src.core.cookies import CookiesManager
+        from src.core.downloads import DownloadManager
+        from src.utils.file_utils import FileUtils
+        from src.core.security import SecurityManager
+        from src.core.content_security import ContentSecurityManager
+        from src.plugins.plugin_loader import PluginLoader
+        from src.plugins.plugin_manager import PluginManager
+        from src.plugins.hook_registry import HookRegistry
+        from src.themes.theme_manager import ThemeManager
+
         # Create settings manager
         self.settings_manager = SettingsManager(self)
 
@@ -143,15 +223,7 @@ class Application(QObject):
 
         # Initialize core managers first
         self.logger.info("Initializing core managers...")
-        self.settings_manager.initialize()
-        self.web_engine_manager.initialize()
-        self.tab_manager.initialize()
-        self.history_manager.initialize()
-        self.bookmarks_manager.initialize()
-        self.cookies_manager.initialize()
-        self.download_manager.initialize()
-        self.security_manager.initialize()
-        self.content_security_manager.initialize()
+        self._run_layers(self._INIT_LAYERS, "initialize")
 
         # Initialize hook registry before plugins
         self.logger.info("Initializing hook registry...")
@@ -173,22 +245,26 @@ class Application(QObject):
 
         # Create main window
         self.logger.info("Creating main window...")
-        self.main_window = MainWindow(self)
-
-        # Connect plugin UI components now that the main window exists
-        for plugin in self.plugin_loader.loaded_plugins.values():
-            try:
-                plugin["api"].ui.connect_main_window(self.main_window)
-            except Exception as e:
-                self.logger.error(f"Error connecting plugin {plugin['id']} UI: {e}")
+        from src.ui.main_window import MainWindow
 
-        # Show main window
-        if self.main_window:
-            self.main_window.show()
-            self.logger.info("Main window created and shown.")
-        else:
-            self.logger.error("Main window could not be created.")
+        try:
+            self.main_window = MainWindow(self)
+        except Exception as e:
+            self.logger.error("Main window could not be created: %s", e)
             return False
+        self.logger.info("Main window created.")
+
+        # Connect plugin UI components now that the main window exists
+        main_window = self.main_window
+        for plugin_id, plugin in self.plugin_loader.loaded_plugins.items():
+            connect = getattr(plugin["api"].ui, "connect_main_window", None)
+            if connect is not None:
+                self._safe(
+                    connect,
+                    main_window,
+                    logger=self.logger,
+                    msg=f"Error connecting plugin {plugin_id} UI",
+                )
 
         # Trigger browser start hook after plugins are enabled
         self.logger.info("Triggering browser start hook...")
@@ -208,17 +284,58 @@ class Application(QObject):
         try:
             # Get all available plugins
             available_plugins = self.plugin_manager.get_available_plugins()
-            self.logger.info(f"Found {len(available_plugins)} available plugins")
+            self.logger.info("Found %d available plugins", len(available_plugins))
 
-            # Enable all plugins
+            # Enable plugins on this thread: activate() may create QObjects,
+            # timers or widgets and registers hooks in a fixed order
             for plugin_id in available_plugins:
-                try:
-                    self.logger.info(f"Enabling plugin: {plugin_id}")
-                    self.plugin_manager.enable_plugin(plugin_id)
-                except Exception as e:
-                    self.logger.error(f"Error enabling plugin {plugin_id}: {str(e)}")
+                self.logger.info("Enabling plugin: %s", plugin_id)
+                self._safe(
+                    self.plugin_manager.enable_plugin,
+                    plugin_id,
+                    logger=self.logger,
+                    msg=f"Error enabling plugin {plugin_id}",
+                )
         except Exception as e:
-            self.logger.error(f"Error initializing plugins: {str(e)}")
+            self.logger.error("Error initializing plugins: %s", e)
+
+    def _run_layers(self, layers, method_name, safe=False):
+        """
+        Call method_name on each manager, layer by layer.
+        With safe set, a failing manager is logged and the rest still run.
+        """
+        for layer in layers:
+            if len(layer) == 1:
+                self._call_manager(layer[0], method_name, safe)
+                continue
+
+            with ThreadPoolExecutor(max_workers=len(layer)) as executor:
+                list(
+                    executor.map(
+                        lambda name: self._call_manager(name, method_name, safe),
+                        layer,
+                    )
+                )
+
+    def _call_manager(self, name, method_name, safe):
+        """Call method_name on the named manager."""
+        if not safe:
+            return getattr(getattr(self, name), method_name)()
+
+        return self._safe(
+            lambda: getattr(getattr(self, name), method_name)(),
+            logger=self.logger,
+            msg=f"Error calling {name}.{method_name}",
+        )
+
+    @staticmethod
+    def _safe(fn, *args, logger, msg):
+        """Call fn(*args), logging instead of raising on failure."""
+        try:
+            return fn(*args)
+        except Exception as e:
+            logger.error("%s: %s", msg, e)
+            return None
 
     def show(self):  # <--- ADD THIS METHOD
         if self.main_window:
@@ -230,26 +347,18 @@ class Application(QObject):
         """Clean up the application."""
         self.logger.info("Cleaning up NebulaFusion browser...")
 
+        # Write out buffered log records before managers shut down
+        for handler in self.logger.handlers:
+            handler.flush()
+
         # Emit closing signal
         self.closing.emit()
 
         # Trigger hook
         self.hook_registry.trigger_hook("onBrowserExit")
 
-        # Clean up managers
-        self.theme_manager.cleanup()
-        self.plugin_manager.cleanup()
-        self.plugin_loader.cleanup()
-        self.hook_registry.cleanup()
-        self.content_security_manager.cleanup()
-        self.security_manager.cleanup()
-        self.download_manager.cleanup()
-        self.cookies_manager.cleanup()
-        self.bookmarks_manager.cleanup()
-        self.history_manager.cleanup()
-        self.tab_manager.cleanup()
-        self.web_engine_manager.cleanup()
-        self.settings_manager.cleanup()
+        # Clean up managers; one failing manager must not skip the others
+        self._run_layers(self._CLEANUP_LAYERS, "cleanup", safe=True)
 
         self.logger.info("NebulaFusion browser cleaned up.")
 
@@ -257,30 +366,29 @@ class Application(QObject):
 
     def get_version(self):
         """Get the application version."""
-        return "1.0.0"
+        return self.VERSION
 
     def get_name(self):
         """Get the application name."""
-        return "NebulaFusion"
+        return self.NAME
 
     def get_description(self):
         """Get the application description."""
-        return "A modern web browser with a robust plugin system."
+        return self.DESCRIPTION
 
     def get_author(self):
         """Get the application author."""
-        return "NebulaFusion Team"
+        return self.AUTHOR
 
     def get_website(self):
         """Get the application website."""
-        return "https://nebulafusion.example.com"
+        return self.WEBSITE
 
     def get_license(self):
         """Get the application license."""
-        return "MIT"
+        return self.LICENSE
 
 
-# SettingsManager class remains unchanged from your provided file, it seems correct.
 class SettingsManager(QObject):
     """
     Manager for application settings.
@@ -290,20 +398,13 @@ class SettingsManager(QObject):
     # Signals
     setting_changed = pyqtSignal(str, object)  # key, value
 
-    def __init__(self, app_controller):
-        """Initialize the settings manager."""
-        super().__init__()
-        self.app_controller = app_controller
-
-        # Settings
-        self.settings = QSettings("NebulaFusion", "Browser")
-
-        # Default settings
-        self.default_settings = {
+    # Default settings, shared by every instance
+    DEFAULT_SETTINGS = MappingProxyType(
+        {
             "general.homepage": "https://www.google.com",
             "general.search_engine": "https://www.google.com/search?q=",
             "general.new_tab_page": "about:newtab",
-            "general.download_directory": os.path.expanduser("~/Downloads"),
+            "general.download_directory": _DOWNLOADS_DIR,
             "general.startup_mode": "restore",  # restore, homepage, blank
             "general.language": "en-US",
             "privacy.do_not_track": True,
@@ -323,6 +424,32 @@ class SettingsManager(QObject):
             "advanced.plugins_enabled": True,
             "advanced.developer_tools_enabled": True,
         }
+    )
+
+    # Type conversion for each stored setting, derived from its default
+    _COERCERS = MappingProxyType(
+        {key: _coercer_for(value) for key, value in DEFAULT_SETTINGS.items()}
+    )
+
+    def __init__(self, app_controller):
+        """Initialize the settings manager."""
+        super().__init__()
+        self.app_controller = app_controller
+
+        # Settings
+        self.settings = QSettings("NebulaFusion", "Browser")
+
+        # Default settings
+        self._defaults = self.DEFAULT_SETTINGS
+
+        # Current setting values
+        self._values = {}
+
+        # Whether QSettings holds changes not yet synced to disk
+        self._sync_pending = False
+
+        # Delay before changed settings are synced to disk (ms)
+        self._flush_delay = 5000
 
         # Initialize settings
         self.initialized = (
@@ -357,51 +484,61 @@ class SettingsManager(QObject):
 
         return True
 
+    @property
+    def default_settings(self):
+        """Read-only default settings (deprecated alias of ``_defaults``)."""
+        return self._defaults
+
     def _load_settings(self):
         """Load settings."""
         # Load settings from QSettings
-        for key, default_value in self.default_settings.items():
-            value = self.settings.value(key, default_value)
-
-            # Convert value to correct type
-            if isinstance(default_value, bool):
-                if isinstance(value, str):
-                    value = value.lower() in ["true", "1", "yes"]
-                else:
-                    value = bool(value)
-            elif isinstance(default_value, int):
-                value = int(value)
-            elif isinstance(default_value, float):
-                value = float(value)
-
-            # Set setting
-            self.set_setting(key, value, emit_signal=False)
+        coercers = self._COERCERS
+        for key, default_value in self._defaults.items():
+            # Convert value to correct type; the value came from QSettings
+            # so no writeback
+            self._values[key] = coercers[key](self.settings.value(key, default_value))
 
     def _save_settings(self):
         """Save settings."""
-        # Save settings to QSettings
-        for key, value in self.default_settings.items():
-            self.settings.setValue(key, value)
+        # set_setting writes every change to QSettings; sync unconditionally
+        # so nothing depends on the batched flush having been scheduled
+        self._sync_pending = False
+        self.settings.sync()
+
+    def flush(self):
+        """Sync pending setting changes to disk."""
+        if not self._sync_pending:
+            return
+        self._sync_pending = False
+
         # Ensure the settings are written to disk
         self.settings.sync()
 
     def get_setting(self, key, default=None):
         """Get a setting."""
-        # Check if key exists
-        if key in self.default_settings:
-            return self.default_settings[key]
+        return self._values.get(key, self._defaults.get(key, default))
 
-        # Return default value
-        return default
+    def get_all_settings(self):
+        """Get all current settings, falling back to defaults."""
+        return {**self._defaults, **self._values}
 
     def set_setting(self, key, value, emit_signal=True):
         """Set a setting."""
+        # Nothing to write or announce when the value is unchanged
+        if key in self._values and self._values[key] == value:
+            return True
+
         # Set setting
-        self.default_settings[key] = value
+        self._values[key] = value
 
-        # Save setting
+        # Save setting; QSettings keeps it even if the batched sync never runs
         self.settings.setValue(key, value)
 
+        # Batch the disk sync with other changes
+        if not self._sync_pending:
+            self._sync_pending = True
+            QTimer.singleShot(self._flush_delay, self.flush)
+
         # Emit signal
         if emit_signal:
             self.setting_changed.emit(key, value)
@@ -411,9 +548,9 @@ class SettingsManager(QObject):
     def reset_setting(self, key):
         """Reset a setting to its default value."""
         # Check if key exists
-        if key in self.default_settings:
+        if key in self._defaults:
             # Get default value
-            default_value = self.default_settings[key]
+            default_value = self._defaults[key]
 
             # Set setting
             self.set_setting(key, default_value)
@@ -425,7 +562,7 @@ class SettingsManager(QObject):
     def reset_all_settings(self):
         """Reset all settings to their default values."""
         # Reset all settings
-        for key in self.default_settings:
+        for key in self._defaults:
             self.reset_setting(key)
 
         return True
@@ -3,10 +3,72 @@
 
 import os
 import sys
-import json
+import html
 import sqlite3
 import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
 from PyQt6.QtCore import QObject, pyqtSignal, QUrl
+from src.utils.json_utils import json_dumps, json_loads
+from src.utils.sqlite_utils import MMAP_SIZE, ReadConnectionPool, configure_connection
+
+class _NetscapeBookmarkParser(HTMLParser):
+    """
+    Streaming parser for Netscape bookmark files.
+    Collects (url, title, folder) rows, naming each folder after the
+    nearest enclosing <H3> heading.
+    """
+    
+    def __init__(self, default_folder):
+        """Initialize the parser."""
+        super().__init__()
+        self.default_folder = default_folder
+        self.rows = []
+        
+        # Folder of each open <DL>
+        self._folder_stack = []
+        
+        # Heading seen since the last <DL>
+        self._pending_folder = None
+        
+        # Text being collected for the current <H3> or <A>
+        self._text = None
+        self._href = None
+    
+    def _current_folder(self):
+        """Get the folder for bookmarks at the current nesting level."""
+        return self._folder_stack[-1] if self._folder_stack else self.default_folder
+    
+    def handle_starttag(self, tag, attrs):
+        """Handle an opening tag."""
+        if tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+        elif tag == "h3":
+            self._text = []
+        elif tag == "dl":
+            self._folder_stack.append(self._pending_folder or self._current_folder())
+            self._pending_folder = None
+    
+    def handle_endtag(self, tag):
+        """Handle a closing tag."""
+        if tag == "a" and self._text is not None:
+            title = "".join(self._text).strip()
+            if self._href and title:
+                self.rows.append((self._href, title, self._current_folder()))
+            self._href = None
+            self._text = None
+        elif tag == "h3" and self._text is not None:
+            self._pending_folder = "".join(self._text).strip() or None
+            self._text = None
+        elif tag == "dl" and self._folder_stack:
+            self._folder_stack.pop()
+    
+    def handle_data(self, data):
+        """Handle text content."""
+        if self._text is not None:
+            self._text.append(data)
 
 class BookmarksManager(QObject):
     """
@@ -24,6 +86,23 @@ class BookmarksManager(QObject):
     bookmarks_imported = pyqtSignal()
     bookmarks_exported = pyqtSignal()
     
+    # Carries cache updates from the I/O worker to this object's thread
+    _bulk_rows_written = pyqtSignal(object, object)  # folder name -> ID, (url, folder_id) pairs
+    
+    # Rows per executemany call during bulk import
+    _IMPORT_CHUNK_SIZE = 5000
+    
+    # Imports at least this large rebuild the folder index once afterwards
+    _REINDEX_THRESHOLD = 10000
+    
+    # Every bookmark with its folder name, ordered for listing and export
+    _ALL_BOOKMARKS_SQL = """
+    SELECT b.url, b.title, f.name AS folder, b.created_at, b.updated_at
+    FROM bookmarks b
+    JOIN folders f ON b.folder_id = f.id
+    ORDER BY f.name, b.title
+    """
+    
     def __init__(self, app_controller):
         """Initialize the bookmarks manager."""
         super().__init__()
@@ -31,6 +110,22 @@ class BookmarksManager(QObject):
         
         # Database connection
         self.db_conn = None
+        self._db_path = None
+        
+        # Folder name -> ID, filled from the database on demand
+        self._folder_id_cache = {}
+        
+        # Bookmarked URL -> IDs of the folders holding it
+        self._url_folders = defaultdict(set)
+        
+        # Read-only connections for query methods
+        self._read_pool = ReadConnectionPool()
+        
+        # Whether the full-text search index is available
+        self._fts_enabled = False
+        
+        # Runs imports and exports off the calling thread
+        self._io_executor = None
         
         # Default folders
         self.default_folders = [
@@ -41,6 +136,11 @@ class BookmarksManager(QObject):
         
         # Initialize bookmarks
         self.initialized = False
+        
+        # Finish imports and exports on this object's thread
+        self._bulk_rows_written.connect(self._on_bulk_rows_written)
+        self.bookmarks_imported.connect(self._on_bookmarks_imported)
+        self.bookmarks_exported.connect(self._on_bookmarks_exported)
     
     def initialize(self):
         """Initialize the bookmarks manager."""
@@ -52,7 +152,9 @@ class BookmarksManager(QObject):
         
         # Connect to database
         db_path = os.path.join(bookmarks_dir, "bookmarks.db")
-        self.db_conn = sqlite3.connect(db_path)
+        self._db_path = db_path
+        self.db_conn = sqlite3.connect(db_path, check_same_thread=False)
+        configure_connection(self.db_conn, mmap_size=MMAP_SIZE)
         
         # Create tables
         self._create_tables()
@@ -60,6 +162,20 @@ class BookmarksManager(QObject):
         # Create default folders
         self._create_default_folders()
         
+        # Open read-only connections; WAL lets them read while writing
+        self._read_pool.open(db_path, mmap_size=MMAP_SIZE, row_factory=sqlite3.Row)
+        
+        # Start the import/export worker
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bookmarks-io")
+        
+        # Cache folder IDs
+        self._folder_id_cache = dict(self.db_conn.execute("SELECT name, id FROM folders"))
+        
+        # Cache bookmarked URLs
+        self._url_folders.clear()
+        for url, folder_id in self.db_conn.execute("SELECT url, folder_id FROM bookmarks"):
+            self._url_folders[url].add(folder_id)
+        
         # Update state
         self.initialized = True
         
@@ -71,7 +187,14 @@ class BookmarksManager(QObject):
         """Clean up the bookmarks manager."""
         self.app_controller.logger.info("Cleaning up bookmarks manager...")
         
-        # Close database connection
+        # Let a running import or export finish
+        if self._io_executor:
+            self._io_executor.shutdown(wait=True)
+            self._io_executor = None
+        
+        # Close database connection; closing the last connection
+        # checkpoints the WAL and removes the -wal/-shm sidecar files
+        self._read_pool.close()
         if self.db_conn:
             self.db_conn.close()
             self.db_conn = None
@@ -83,13 +206,20 @@ class BookmarksManager(QObject):
         
         return True
     
+    @staticmethod
+    def _rows_to_dicts(cursor, batch_size=1000):
+        """Convert sqlite3.Row results to dictionaries in batches."""
+        results = []
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                return results
+            results.extend(dict(row) for row in batch)
+    
     def _create_tables(self):
         """Create database tables."""
-        # Create cursor
-        cursor = self.db_conn.cursor()
-        
         # Create folders table
-        cursor.execute("""
+        self.db_conn.execute("""
         CREATE TABLE IF NOT EXISTS folders (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT UNIQUE,
@@ -99,7 +229,7 @@ class BookmarksManager(QObject):
         """)
         
         # Create bookmarks table
-        cursor.execute("""
+        self.db_conn.execute("""
         CREATE TABLE IF NOT EXISTS bookmarks (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             url TEXT,
@@ -112,64 +242,166 @@ class BookmarksManager(QObject):
         )
         """)
         
+        # Create index covering folder listings ordered by title
+        self._create_folder_index(self.db_conn)
+        
         # Commit changes
         self.db_conn.commit()
+        
+        # Create full-text index for search
+        self._create_search_index()
+    
+    def _create_folder_index(self, conn):
+        """Create the index covering folder listings ordered by title."""
+        conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_bm_folder_title ON bookmarks (folder_id, title)
+        """)
+    
+    def _create_search_index(self):
+        """Create the trigram full-text index used by search_bookmarks."""
+        try:
+            exists = self.db_conn.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'bookmarks_fts'
+            """).fetchone() is not None
+            
+            # The trigram tokenizer keeps substring semantics of LIKE '%q%'
+            self.db_conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS bookmarks_fts USING fts5(
+                url, title, content='bookmarks', content_rowid='id', tokenize='trigram'
+            )
+            """)
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5 or older than 3.34
+            self.app_controller.logger.warning(f"Bookmark full-text search unavailable: {e}")
+            self._fts_enabled = False
+            return
+        
+        # Keep the index in sync with the bookmarks table
+        self.db_conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS bookmarks_fts_ai AFTER INSERT ON bookmarks BEGIN
+            INSERT INTO bookmarks_fts (rowid, url, title) VALUES (new.id, new.url, new.title);
+        END
+        """)
+        self.db_conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS bookmarks_fts_ad AFTER DELETE ON bookmarks BEGIN
+            INSERT INTO bookmarks_fts (bookmarks_fts, rowid, url, title) VALUES ('delete', old.id, old.url, old.title);
+        END
+        """)
+        self.db_conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS bookmarks_fts_au AFTER UPDATE ON bookmarks BEGIN
+            INSERT INTO bookmarks_fts (bookmarks_fts, rowid, url, title) VALUES ('delete', old.id, old.url, old.title);
+            INSERT INTO bookmarks_fts (rowid, url, title) VALUES (new.id, new.url, new.title);
+        END
+        """)
+        
+        # Index bookmarks stored before the index existed
+        if not exists:
+            self.db_conn.execute("""
+            INSERT INTO bookmarks_fts (bookmarks_fts) VALUES ('rebuild')
+            """)
+        
+        # Commit changes
+        self.db_conn.commit()
+        
+        self._fts_enabled = True
     
     def _create_default_folders(self):
         """Create default folders."""
-        # Create cursor
-        cursor = self.db_conn.cursor()
-        
         # Get current time
         current_time = int(time.time())
         
         # Create default folders
-        for folder_name in self.default_folders:
-            cursor.execute("""
-            INSERT OR IGNORE INTO folders (name, created_at, updated_at)
-            VALUES (?, ?, ?)
-            """, (folder_name, current_time, current_time))
+        self.db_conn.executemany("""
+        INSERT OR IGNORE INTO folders (name, created_at, updated_at)
+        VALUES (?, ?, ?)
+        """, [(folder_name, current_time, current_time) for folder_name in self.default_folders])
         
         # Commit changes
         self.db_conn.commit()
     
+    def _get_folder_id(self, folder_name):
+        """Get a folder ID, or None if the folder does not exist."""
+        folder_id = self._folder_id_cache.get(folder_name)
+        if folder_id is not None:
+            return folder_id
+        
+        row = self.db_conn.execute("""
+        SELECT id FROM folders WHERE name = ?
+        """, (folder_name,)).fetchone()
+        
+        if not row:
+            return None
+        
+        self._folder_id_cache[folder_name] = row[0]
+        return row[0]
+    
+    def _ensure_folder_id(self, folder_name, current_time):
+        """
+        Get a folder ID, inserting the folder if it does not exist.
+        Returns (folder_id, created). The caller commits.
+        """
+        folder_id = self._get_folder_id(folder_name)
+        if folder_id is not None:
+            return folder_id, False
+        
+        # No RETURNING clause, which needs SQLite 3.35
+        cursor = self.db_conn.execute("""
+        INSERT INTO folders (name, created_at, updated_at)
+        VALUES (?, ?, ?)
+        ON CONFLICT (name) DO NOTHING
+        """, (folder_name, current_time, current_time))
+        
+        if cursor.rowcount != 1:
+            # Inserted by another connection since the lookup
+            return self._get_folder_id(folder_name), False
+        
+        self._folder_id_cache[folder_name] = cursor.lastrowid
+        return cursor.lastrowid, True
+    
+    def _folder_added(self, folder_name):
+        """Announce a new bookmark folder."""
+        # Emit signal
+        self.folder_added.emit(folder_name)
+        
+        # Trigger hook
+        self.app_controller.hook_registry.trigger_hook("onBookmarkFolderAdded", folder_name)
+        
+        self.app_controller.logger.info(f"Bookmark folder added: {folder_name}")
+    
+    def _refresh_url_folders(self, *urls):
+        """Reload the cached folder IDs of the given URLs."""
+        for url in urls:
+            self._url_folders.pop(url, None)
+        
+        placeholders = ", ".join("?" * len(urls))
+        for url, folder_id in self.db_conn.execute(f"""
+        SELECT url, folder_id FROM bookmarks WHERE url IN ({placeholders})
+        """, urls):
+            self._url_folders[url].add(folder_id)
+    
     def add_bookmark(self, url, title, folder="Bookmarks Bar"):
         """Add a bookmark."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
             # Get current time
             current_time = int(time.time())
             
-            # Get folder ID
-            cursor.execute("""
-            SELECT id FROM folders WHERE name = ?
-            """, (folder,))
-            
-            folder_id = cursor.fetchone()
-            
-            if not folder_id:
-                # Create folder
-                self.add_folder(folder)
-                
-                # Get folder ID
-                cursor.execute("""
-                SELECT id FROM folders WHERE name = ?
-                """, (folder,))
-                
-                folder_id = cursor.fetchone()
-            
-            folder_id = folder_id[0]
+            # Get folder ID, creating the folder if needed
+            folder_id, folder_created = self._ensure_folder_id(folder, current_time)
             
             # Add bookmark
-            cursor.execute("""
-            INSERT OR REPLACE INTO bookmarks (url, title, folder_id, created_at, updated_at)
+            self.db_conn.execute("""
+            INSERT INTO bookmarks (url, title, folder_id, created_at, updated_at)
             VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (url, folder_id) DO UPDATE
+            SET title = excluded.title, updated_at = excluded.updated_at
             """, (url, title, folder_id, current_time, current_time))
             
             # Commit changes
             self.db_conn.commit()
+            self._url_folders[url].add(folder_id)
+            
+            if folder_created:
+                self._folder_added(folder)
             
             # Emit signal
             self.bookmark_added.emit(url, title, folder)
@@ -188,35 +420,34 @@ class BookmarksManager(QObject):
     def remove_bookmark(self, url, folder=None):
         """Remove a bookmark."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
             if folder:
                 # Get folder ID
-                cursor.execute("""
-                SELECT id FROM folders WHERE name = ?
-                """, (folder,))
-                
-                folder_id = cursor.fetchone()
+                folder_id = self._get_folder_id(folder)
                 
-                if not folder_id:
+                if folder_id is None:
                     self.app_controller.logger.warning(f"Folder not found: {folder}")
                     return False
                 
-                folder_id = folder_id[0]
-                
                 # Remove bookmark
-                cursor.execute("""
+                self.db_conn.execute("""
                 DELETE FROM bookmarks WHERE url = ? AND folder_id = ?
                 """, (url, folder_id))
             else:
                 # Remove bookmark from all folders
-                cursor.execute("""
+                self.db_conn.execute("""
                 DELETE FROM bookmarks WHERE url = ?
                 """, (url,))
             
             # Commit changes
             self.db_conn.commit()
+            if folder:
+                folder_ids = self._url_folders.get(url)
+                if folder_ids is not None:
+                    folder_ids.discard(folder_id)
+                    if not folder_ids:
+                        del self._url_folders[url]
+            else:
+                self._url_folders.pop(url, None)
             
             # Emit signal
             self.bookmark_removed.emit(url, folder or "all")
@@ -235,21 +466,14 @@ class BookmarksManager(QObject):
     def update_bookmark(self, url, new_url=None, new_title=None, new_folder=None):
         """Update a bookmark."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
             # Get current time
             current_time = int(time.time())
             
             # Get bookmark
-            cursor.execute("""
-            SELECT b.id, b.title, f.name
-            FROM bookmarks b
-            JOIN folders f ON b.folder_id = f.id
-            WHERE b.url = ?
-            """, (url,))
-            
-            bookmark = cursor.fetchone()
+            bookmark = self.db_conn.execute("""
+            SELECT id, title, (SELECT name FROM folders WHERE id = folder_id)
+            FROM bookmarks WHERE url = ? LIMIT 1
+            """, (url,)).fetchone()
             
             if not bookmark:
                 self.app_controller.logger.warning(f"Bookmark not found: {url}")
@@ -257,44 +481,34 @@ class BookmarksManager(QObject):
             
             bookmark_id, title, folder = bookmark
             
-            # Update bookmark
-            if new_folder and new_folder != folder:
-                # Get new folder ID
-                cursor.execute("""
-                SELECT id FROM folders WHERE name = ?
-                """, (new_folder,))
-                
-                new_folder_id = cursor.fetchone()
-                
-                if not new_folder_id:
-                    # Create folder
-                    self.add_folder(new_folder)
-                    
-                    # Get folder ID
-                    cursor.execute("""
-                    SELECT id FROM folders WHERE name = ?
-                    """, (new_folder,))
-                    
-                    new_folder_id = cursor.fetchone()
-                
-                new_folder_id = new_folder_id[0]
+            # Create the new folder if needed and move the bookmark in one
+            # transaction, so a failed update leaves no new folder behind
+            new_folder_id = None
+            folder_created = False
+            try:
+                if new_folder:
+                    new_folder_id, folder_created = self._ensure_folder_id(new_folder, current_time)
                 
-                # Update bookmark
-                cursor.execute("""
-                UPDATE bookmarks
-                SET url = ?, title = ?, folder_id = ?, updated_at = ?
-                WHERE id = ?
-                """, (new_url or url, new_title or title, new_folder_id, current_time, bookmark_id))
-            else:
-                # Update bookmark
-                cursor.execute("""
+                # Update bookmark, keeping current values for unset fields
+                self.db_conn.execute("""
                 UPDATE bookmarks
-                SET url = ?, title = ?, updated_at = ?
+                SET url = ?, title = COALESCE(?, title), folder_id = COALESCE(?, folder_id), updated_at = ?
                 WHERE id = ?
-                """, (new_url or url, new_title or title, current_time, bookmark_id))
+                """, (new_url or url, new_title or None, new_folder_id, current_time, bookmark_id))
+                
+                # Commit changes
+                self.db_conn.commit()
             
-            # Commit changes
-            self.db_conn.commit()
+            except Exception:
+                self.db_conn.rollback()
+                if folder_created:
+                    self._folder_id_cache.pop(new_folder, None)
+                raise
+            
+            if folder_created:
+                self._folder_added(new_folder)
+            
+            self._refresh_url_folders(url, new_url or url)
             
             # Emit signal
             self.bookmark_updated.emit(url, new_url or url, new_title or title, new_folder or folder)
@@ -313,28 +527,16 @@ class BookmarksManager(QObject):
     def add_folder(self, folder_name):
         """Add a bookmark folder."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
             # Get current time
             current_time = int(time.time())
             
             # Add folder
-            cursor.execute("""
-            INSERT OR IGNORE INTO folders (name, created_at, updated_at)
-            VALUES (?, ?, ?)
-            """, (folder_name, current_time, current_time))
+            self._ensure_folder_id(folder_name, current_time)
             
             # Commit changes
             self.db_conn.commit()
             
-            # Emit signal
-            self.folder_added.emit(folder_name)
-            
-            # Trigger hook
-            self.app_controller.hook_registry.trigger_hook("onBookmarkFolderAdded", folder_name)
-            
-            self.app_controller.logger.info(f"Bookmark folder added: {folder_name}")
+            self._folder_added(folder_name)
             
             return True
         
@@ -350,34 +552,30 @@ class BookmarksManager(QObject):
                 self.app_controller.logger.warning(f"Cannot remove default folder: {folder_name}")
                 return False
             
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
             # Get folder ID
-            cursor.execute("""
-            SELECT id FROM folders WHERE name = ?
-            """, (folder_name,))
-            
-            folder_id = cursor.fetchone()
+            folder_id = self._get_folder_id(folder_name)
             
-            if not folder_id:
+            if folder_id is None:
                 self.app_controller.logger.warning(f"Folder not found: {folder_name}")
                 return False
             
-            folder_id = folder_id[0]
-            
             # Remove bookmarks in folder
-            cursor.execute("""
+            self.db_conn.execute("""
             DELETE FROM bookmarks WHERE folder_id = ?
             """, (folder_id,))
             
             # Remove folder
-            cursor.execute("""
+            self.db_conn.execute("""
             DELETE FROM folders WHERE id = ?
             """, (folder_id,))
             
             # Commit changes
             self.db_conn.commit()
+            self._folder_id_cache.pop(folder_name, None)
+            for url in [url for url, folder_ids in self._url_folders.items() if folder_id in folder_ids]:
+                self._url_folders[url].discard(folder_id)
+                if not self._url_folders[url]:
+                    del self._url_folders[url]
             
             # Emit signal
             self.folder_removed.emit(folder_name)
@@ -401,14 +599,11 @@ class BookmarksManager(QObject):
                 self.app_controller.logger.warning(f"Cannot rename default folder: {old_name}")
                 return False
             
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
             # Get current time
             current_time = int(time.time())
             
             # Rename folder
-            cursor.execute("""
+            self.db_conn.execute("""
             UPDATE folders
             SET name = ?, updated_at = ?
             WHERE name = ?
@@ -416,6 +611,9 @@ class BookmarksManager(QObject):
             
             # Commit changes
             self.db_conn.commit()
+            folder_id = self._folder_id_cache.pop(old_name, None)
+            if folder_id is not None:
+                self._folder_id_cache[new_name] = folder_id
             
             # Emit signal
             self.folder_renamed.emit(old_name, new_name)
@@ -434,53 +632,29 @@ class BookmarksManager(QObject):
     def get_bookmarks(self, folder=None):
         """Get bookmarks."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
-            if folder:
-                # Get folder ID
-                cursor.execute("""
-                SELECT id FROM folders WHERE name = ?
-                """, (folder,))
-                
-                folder_id = cursor.fetchone()
-                
-                if not folder_id:
-                    self.app_controller.logger.warning(f"Folder not found: {folder}")
-                    return []
-                
-                folder_id = folder_id[0]
+            with self._read_pool.connection() as conn:
+                if folder:
+                    # Get folder ID
+                    folder_id = self._get_folder_id(folder)
+                    
+                    if folder_id is None:
+                        self.app_controller.logger.warning(f"Folder not found: {folder}")
+                        return []
+                    
+                    # Get bookmarks
+                    cursor = conn.execute("""
+                    SELECT b.url, b.title, f.name AS folder, b.created_at, b.updated_at
+                    FROM bookmarks b
+                    JOIN folders f ON b.folder_id = f.id
+                    WHERE b.folder_id = ?
+                    ORDER BY b.title
+                    """, (folder_id,))
+                else:
+                    # Get all bookmarks
+                    cursor = conn.execute(self._ALL_BOOKMARKS_SQL)
                 
-                # Get bookmarks
-                cursor.execute("""
-                SELECT b.url, b.title, f.name, b.created_at, b.updated_at
-                FROM bookmarks b
-                JOIN folders f ON b.folder_id = f.id
-                WHERE b.folder_id = ?
-                ORDER BY b.title
-                """, (folder_id,))
-            else:
-                # Get all bookmarks
-                cursor.execute("""
-                SELECT b.url, b.title, f.name, b.created_at, b.updated_at
-                FROM bookmarks b
-                JOIN folders f ON b.folder_id = f.id
-                ORDER BY f.name, b.title
-                """)
-            
-            # Convert to list of dictionaries
-            bookmarks = []
-            for row in cursor.fetchall():
-                url, title, folder_name, created_at, updated_at = row
-                bookmarks.append({
-                    "url": url,
-                    "title": title,
-                    "folder": folder_name,
-                    "created_at": created_at,
-                    "updated_at": updated_at
-                })
-            
-            return bookmarks
+                # Convert to list of dictionaries
+                return self._rows_to_dicts(cursor)
         
         except Exception as e:
             self.app_controller.logger.error(f"Error getting bookmarks: {e}")
@@ -489,18 +663,16 @@ class BookmarksManager(QObject):
     def get_folders(self):
         """Get bookmark folders."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
-            # Get folders
-            cursor.execute("""
-            SELECT name FROM folders ORDER BY name
-            """)
-            
-            # Convert to list
-            folders = [row[0] for row in cursor.fetchall()]
-            
-            return folders
+            with self._read_pool.connection() as conn:
+                # Get folders
+                cursor = conn.execute("""
+                SELECT name FROM folders ORDER BY name
+                """)
+                
+                # Convert to list
+                folders = [row[0] for row in cursor.fetchall()]
+                
+                return folders
         
         except Exception as e:
             self.app_controller.logger.error(f"Error getting bookmark folders: {e}")
@@ -509,44 +681,52 @@ class BookmarksManager(QObject):
     def search_bookmarks(self, query):
         """Search bookmarks."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
-            # Search bookmarks
-            cursor.execute("""
-            SELECT b.url, b.title, f.name, b.created_at, b.updated_at
-            FROM bookmarks b
-            JOIN folders f ON b.folder_id = f.id
-            WHERE b.url LIKE ? OR b.title LIKE ?
-            ORDER BY f.name, b.title
-            """, (f"%{query}%", f"%{query}%"))
-            
-            # Convert to list of dictionaries
-            bookmarks = []
-            for row in cursor.fetchall():
-                url, title, folder_name, created_at, updated_at = row
-                bookmarks.append({
-                    "url": url,
-                    "title": title,
-                    "folder": folder_name,
-                    "created_at": created_at,
-                    "updated_at": updated_at
-                })
-            
-            return bookmarks
+            with self._read_pool.connection() as conn:
+                # Search bookmarks; trigrams need at least three characters
+                if self._fts_enabled and len(query) >= 3:
+                    cursor = conn.execute("""
+                    SELECT b.url, b.title, f.name AS folder, b.created_at, b.updated_at
+                    FROM bookmarks_fts
+                    JOIN bookmarks b ON b.id = bookmarks_fts.rowid
+                    JOIN folders f ON b.folder_id = f.id
+                    WHERE bookmarks_fts MATCH ?
+                    ORDER BY f.name, b.title
+                    """, ('"' + query.replace('"', '""') + '"',))
+                else:
+                    cursor = conn.execute("""
+                    SELECT b.url, b.title, f.name AS folder, b.created_at, b.updated_at
+                    FROM bookmarks b
+                    JOIN folders f ON b.folder_id = f.id
+                    WHERE b.url LIKE ? OR b.title LIKE ?
+                    ORDER BY f.name, b.title
+                    """, (f"%{query}%", f"%{query}%"))
+                
+                # Convert to list of dictionaries
+                return self._rows_to_dicts(cursor)
         
         except Exception as e:
             self.app_controller.logger.error(f"Error searching bookmarks: {e}")
             return []
     
     def import_bookmarks(self, file_path):
+        """Import bookmarks from a file."""
+        return self._import_bookmarks(file_path)
+    
+    def import_bookmarks_async(self, file_path):
+        """
+        Import bookmarks from a file on the I/O worker thread.
+        Returns a Future that resolves to True on success.
+        """
+        return self._io_executor.submit(self._import_bookmarks, file_path)
+    
+    def _import_bookmarks(self, file_path):
         """Import bookmarks from a file."""
         try:
             # Check file extension
             if file_path.endswith(".json"):
                 # Import from JSON
-                with open(file_path, "r") as f:
-                    data = json.load(f)
+                with open(file_path, "rb") as f:
+                    data = json_loads(f.read())
                 
                 # Check if data is valid
                 if not isinstance(data, list):
@@ -554,137 +734,199 @@ class BookmarksManager(QObject):
                     return False
                 
                 # Import bookmarks
-                for bookmark in data:
-                    if "url" in bookmark and "title" in bookmark:
-                        folder = bookmark.get("folder", "Imported Bookmarks")
-                        self.add_bookmark(bookmark["url"], bookmark["title"], folder)
+                rows = [
+                    (bookmark["url"], bookmark["title"], bookmark.get("folder", "Imported Bookmarks"))
+                    for bookmark in data
+                    if "url" in bookmark and "title" in bookmark
+                ]
+                self._bulk_insert_bookmarks(rows)
             
             elif file_path.endswith(".html") or file_path.endswith(".htm"):
-                # Import from HTML
+                # Import from HTML, parsing the file in fixed-size chunks
+                parser = _NetscapeBookmarkParser("Imported Bookmarks")
                 with open(file_path, "r") as f:
-                    content = f.read()
-                
-                # Parse HTML
-                import re
-                
-                # Find all links
-                links = re.findall(r'<A HREF="([^"]+)"[^>]*>([^<]+)</A>', content)
+                    for chunk in iter(lambda: f.read(65536), ""):
+                        parser.feed(chunk)
+                parser.close()
                 
                 # Import bookmarks
-                for url, title in links:
-                    self.add_bookmark(url, title, "Imported Bookmarks")
+                self._bulk_insert_bookmarks(parser.rows)
             
             else:
                 self.app_controller.logger.error("Unsupported bookmarks file format")
                 return False
             
+            self.app_controller.logger.info(f"Bookmarks imported from {file_path}")
+            
             # Emit signal
             self.bookmarks_imported.emit()
             
-            # Trigger hook
-            self.app_controller.hook_registry.trigger_hook("onBookmarksImported")
-            
-            self.app_controller.logger.info(f"Bookmarks imported from {file_path}")
-            
             return True
         
         except Exception as e:
             self.app_controller.logger.error(f"Error importing bookmarks: {e}")
             return False
     
+    def _bulk_insert_bookmarks(self, rows):
+        """
+        Insert (url, title, folder) rows in a single transaction.
+        Uses its own connection so it can run on the I/O worker thread.
+        """
+        if not rows:
+            return
+        
+        # Get current time
+        current_time = int(time.time())
+        
+        conn = sqlite3.connect(self._db_path)
+        configure_connection(conn, mmap_size=MMAP_SIZE)
+        try:
+            folder_ids = self._write_bulk_rows(conn, rows, current_time)
+        finally:
+            conn.close()
+        
+        # Update caches on this object's thread, where they are read
+        self._bulk_rows_written.emit(
+            folder_ids, [(url, folder_ids[folder]) for url, _, folder in rows]
+        )
+        
+        self.app_controller.logger.info(f"Imported {len(rows)} bookmarks")
+    
+    def _write_bulk_rows(self, conn, rows, current_time):
+        """Write imported rows and return the folder name -> ID map."""
+        with conn:
+            # Create any missing folders
+            folder_names = {folder for _, _, folder in rows}
+            conn.executemany("""
+            INSERT OR IGNORE INTO folders (name, created_at, updated_at)
+            VALUES (?, ?, ?)
+            """, [(name, current_time, current_time) for name in folder_names])
+            
+            # Resolve folder IDs once
+            cursor = conn.execute("""
+            SELECT name, id FROM folders
+            """)
+            folder_ids = dict(cursor.fetchall())
+            
+            # Build the folder index once instead of updating it per row
+            reindex = len(rows) >= self._REINDEX_THRESHOLD
+            if reindex:
+                conn.execute("DROP INDEX IF EXISTS idx_bm_folder_title")
+            
+            # Add bookmarks in chunks
+            for start in range(0, len(rows), self._IMPORT_CHUNK_SIZE):
+                chunk = rows[start:start + self._IMPORT_CHUNK_SIZE]
+                conn.executemany("""
+                INSERT INTO bookmarks (url, title, folder_id, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (url, folder_id) DO UPDATE
+                SET title = excluded.title, updated_at = excluded.updated_at
+                """, [
+                    (url, title, folder_ids[folder], current_time, current_time)
+                    for url, title, folder in chunk
+                ])
+            
+            if reindex:
+                self._create_folder_index(conn)
+        
+        return folder_ids
+    
     def export_bookmarks(self, file_path):
+        """Export bookmarks to a file."""
+        return self._export_bookmarks(file_path)
+    
+    def export_bookmarks_async(self, file_path):
+        """
+        Export bookmarks to a file on the I/O worker thread.
+        Returns a Future that resolves to True on success.
+        """
+        return self._io_executor.submit(self._export_bookmarks, file_path)
+    
+    def _export_bookmarks(self, file_path):
         """Export bookmarks to a file."""
         try:
-            # Get all bookmarks
-            bookmarks = self.get_bookmarks()
-            
             # Check file extension
             if file_path.endswith(".json"):
-                # Export to JSON
-                with open(file_path, "w") as f:
-                    json.dump(bookmarks, f, indent=4)
+                # Export to JSON, streaming rows straight from the cursor
+                with self._read_pool.connection() as conn, open(file_path, "wb") as f:
+                    f.write(b"[\n")
+                    for i, row in enumerate(conn.execute(self._ALL_BOOKMARKS_SQL)):
+                        if i:
+                            f.write(b",\n")
+                        f.write(json_dumps(dict(row)))
+                    f.write(b"\n]\n")
             
             elif file_path.endswith(".html") or file_path.endswith(".htm"):
+                # Group bookmarks by folder
+                folders = defaultdict(list)
+                for bookmark in self.get_bookmarks():
+                    folders[bookmark["folder"]].append(bookmark)
+                
+                # Build the document
+                parts = [
+                    '<!DOCTYPE NETSCAPE-Bookmark-file-1>\n',
+                    '<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n',
+                    '<TITLE>Bookmarks</TITLE>\n',
+                    '<H1>Bookmarks</H1>\n',
+                    '<DL><p>\n',
+                ]
+                escape = html.escape
+                link = '        <DT><A HREF="%s">%s</A>\n'
+                for folder, folder_bookmarks in folders.items():
+                    parts.append('    <DT><H3>%s</H3>\n' % escape(folder))
+                    parts.append('    <DL><p>\n')
+                    parts.extend([
+                        link % (escape(bookmark["url"]), escape(bookmark["title"]))
+                        for bookmark in folder_bookmarks
+                    ])
+                    parts.append('    </DL><p>\n')
+                parts.append('</DL><p>\n')
+                
                 # Export to HTML
                 with open(file_path, "w") as f:
-                    f.write('<!DOCTYPE NETSCAPE-Bookmark-file-1>\n')
-                    f.write('<META HTTP-EQUIV="Content-Type" CONTENT="text/html; charset=UTF-8">\n')
-                    f.write('<TITLE>Bookmarks</TITLE>\n')
-                    f.write('<H1>Bookmarks</H1>\n')
-                    f.write('<DL><p>\n')
-                    
-                    # Group bookmarks by folder
-                    folders = {}
-                    for bookmark in bookmarks:
-                        folder = bookmark["folder"]
-                        if folder not in folders:
-                            folders[folder] = []
-                        folders[folder].append(bookmark)
-                    
-                    # Write folders
-                    for folder, folder_bookmarks in folders.items():
-                        f.write(f'    <DT><H3>{folder}</H3>\n')
-                        f.write('    <DL><p>\n')
-                        
-                        # Write bookmarks
-                        for bookmark in folder_bookmarks:
-                            f.write(f'        <DT><A HREF="{bookmark["url"]}">{bookmark["title"]}</A>\n')
-                        
-                        f.write('    </DL><p>\n')
-                    
-                    f.write('</DL><p>\n')
+                    f.write("".join(parts))
             
             else:
                 self.app_controller.logger.error("Unsupported bookmarks file format")
                 return False
             
+            self.app_controller.logger.info(f"Bookmarks exported to {file_path}")
+            
             # Emit signal
             self.bookmarks_exported.emit()
             
-            # Trigger hook
-            self.app_controller.hook_registry.trigger_hook("onBookmarksExported")
-            
-            self.app_controller.logger.info(f"Bookmarks exported to {file_path}")
-            
             return True
         
         except Exception as e:
             self.app_controller.logger.error(f"Error exporting bookmarks: {e}")
             return False
     
+    def _on_bulk_rows_written(self, folder_ids, url_folder_ids):
+        """Add imported folders and bookmarks to the caches."""
+        self._folder_id_cache.update(folder_ids)
+        for url, folder_id in url_folder_ids:
+            self._url_folders[url].add(folder_id)
+    
+    def _on_bookmarks_imported(self):
+        """Trigger the import hook on the manager's thread."""
+        self.app_controller.hook_registry.trigger_hook("onBookmarksImported")
+    
+    def _on_bookmarks_exported(self):
+        """Trigger the export hook on the manager's thread."""
+        self.app_controller.hook_registry.trigger_hook("onBookmarksExported")
+    
     def is_bookmarked(self, url, folder=None):
         """Check if a URL is bookmarked."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
+            # Check the in-memory URL cache
+            folder_ids = self._url_folders.get(url)
+            if not folder_ids:
+                return False
             
             if folder:
-                # Get folder ID
-                cursor.execute("""
-                SELECT id FROM folders WHERE name = ?
-                """, (folder,))
-                
-                folder_id = cursor.fetchone()
-                
-                if not folder_id:
-                    return False
-                
-                folder_id = folder_id[0]
-                
-                # Check if URL is bookmarked
-                cursor.execute("""
-                SELECT COUNT(*) FROM bookmarks WHERE url = ? AND folder_id = ?
-                """, (url, folder_id))
-            else:
-                # Check if URL is bookmarked in any folder
-                cursor.execute("""
-                SELECT COUNT(*) FROM bookmarks WHERE url = ?
-                """, (url,))
+                return self._get_folder_id(folder) in folder_ids
             
-            # Get result
-            count = cursor.fetchone()[0]
-            
-            return count > 0
+            return True
         
         except Exception as e:
             self.app_controller.logger.error(f"Error checking if URL is bookmarked: {e}")
@@ -3,8 +3,154 @@
 
 import os
 import sys
+import mmap
 import logging
-from PyQt6.QtCore import QObject, pyqtSignal, QUrl
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal, QUrl, QTimer, QCoreApplication
+
+try:
+    import marisa_trie
+except ImportError:  # Optional: compact blocklist index
+    marisa_trie = None
+
+@functools.lru_cache(maxsize=4096)
+def _url_domain(url):
+    """Get the domain of a URL without its www prefix."""
+    # Parse URL
+    domain = QUrl(url).host()
+    
+    # Remove www prefix
+    if domain.startswith("www."):
+        domain = domain[4:]
+    
+    return domain
+
+class DomainTrie:
+    """
+    Reverse-label trie of blocked domains.
+    A domain matches when it or any parent domain has been added, so an
+    entry for example.com also blocks ads.example.com. When several
+    entries match, the blocklist type earliest in precedence wins.
+    """
+    
+    # Key marking the end of a blocked domain; never a valid label
+    _END = "$"
+    
+    def __init__(self, precedence=()):
+        """Initialize an empty trie with blocklist types, highest precedence first."""
+        self._root = {}
+        self._ranks = {kind: rank for rank, kind in enumerate(precedence)}
+    
+    def _rank(self, kind):
+        """Get the precedence rank of a blocklist type; lower wins."""
+        return self._ranks.get(kind, len(self._ranks))
+    
+    def __bool__(self):
+        """Return whether the trie holds any domains."""
+        return bool(self._root)
+    
+    def add(self, domain, kind):
+        """Add a domain with its blocklist type."""
+        node = self._root
+        while domain:
+            domain, _, label = domain.rpartition(".")
+            node = node.setdefault(label, {})
+        node[self._END] = kind
+    
+    def discard(self, domain):
+        """Remove a domain if present."""
+        labels = domain.split(".")[::-1]
+        path = [self._root]
+        for label in labels:
+            node = path[-1].get(label)
+            if node is None:
+                return
+            path.append(node)
+        
+        path[-1].pop(self._END, None)
+        
+        # Prune nodes left without children
+        for depth in range(len(labels), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][labels[depth - 1]]
+    
+    def lookup(self, host):
+        """Return the highest precedence type matching host or a parent domain, or None."""
+        # Walk labels right to left, stopping at the first miss; a more
+        # specific entry may outrank the one for its parent domain
+        best = None
+        node = self._root
+        while host:
+            host, _, label = host.rpartition(".")
+            node = node.get(label)
+            if node is None:
+                break
+            kind = node.get(self._END)
+            if kind is not None and (best is None or self._rank(kind) < self._rank(best)):
+                best = kind
+        return best
+
+class CompactDomainTrie:
+    """
+    Read-only domain trie backed by marisa-trie.
+    Domains are stored as reversed-label keys ("com.example.") in a
+    succinct trie, using far less memory than nested dictionaries for
+    large blocklists. Changes after building go to a small overlay.
+    """
+    
+    def __init__(self, blocklists, precedence=()):
+        """Build the trie from (kind, domains) pairs, lowest precedence first."""
+        entries = {}
+        for kind, domains in blocklists:
+            for domain in domains:
+                entries[self._key(domain)] = kind
+        
+        self._trie = marisa_trie.Trie(entries)
+        
+        # Kind of each key, indexed by key ID
+        self._kind_names = []
+        self._kinds = bytearray(len(self._trie))
+        for key, kind in entries.items():
+            if kind not in self._kind_names:
+                self._kind_names.append(kind)
+            self._kinds[self._trie.key_id(key)] = self._kind_names.index(kind)
+        
+        # Changes made after building; the overlay replaces base keys
+        self._added = DomainTrie(precedence)
+        self._removed = set()
+    
+    @staticmethod
+    def _key(domain):
+        """Get the reversed-label key of a domain."""
+        return ".".join(reversed(domain.split("."))) + "."
+    
+    def add(self, domain, kind):
+        """Add a domain with its blocklist type."""
+        # Hide any base entry so its old type cannot outrank the new one
+        self._removed.add(self._key(domain))
+        self._added.add(domain, kind)
+    
+    def discard(self, domain):
+        """Remove a domain if present."""
+        self._added.discard(domain)
+        self._removed.add(self._key(domain))
+    
+    def lookup(self, host):
+        """Return the highest precedence type matching host or a parent domain, or None."""
+        # The overlay is usually empty; skip walking the host twice
+        best = self._added.lookup(host) if self._added else None
+        
+        # Keys end with a dot, so prefixes only match whole labels
+        rank = self._added._rank
+        for key, key_id in self._trie.iter_prefixes_with_ids(self._key(host)):
+            if key not in self._removed:
+                kind = self._kind_names[self._kinds[key_id]]
+                if best is None or rank(kind) < rank(best):
+                    best = kind
+        return best
 
 class ContentSecurityManager(QObject):
     """
@@ -15,6 +161,15 @@ class ContentSecurityManager(QObject):
     # Signals
     threat_detected = pyqtSignal(str, str)  # url, threat_type
     content_blocked = pyqtSignal(str, str)  # url, reason
+    blocklists_loaded = pyqtSignal()
+    
+    # Blocklist type -> (signal, hook, reason, log level, log message)
+    _DISPATCH = {
+        "malware": ("threat_detected", "onThreatDetected", "malware", "warning", "Malware detected"),
+        "phishing": ("threat_detected", "onThreatDetected", "phishing", "warning", "Phishing detected"),
+        "ads": ("content_blocked", "onContentBlocked", "ad", "info", "Ad blocked"),
+        "trackers": ("content_blocked", "onContentBlocked", "tracker", "info", "Tracker blocked")
+    }
     
     def __init__(self, app_controller):
         """Initialize the content security manager."""
@@ -27,6 +182,28 @@ class ContentSecurityManager(QObject):
         self.ad_domains = set()
         self.tracker_domains = set()
         
+        # Lookup index over all blocklists
+        self._trie = DomainTrie(self._get_blocklists())
+        
+        # Blocklist hit handlers, bound in initialize
+        self._dispatch = {}
+        
+        # Background blocklist load started by initialize
+        self._loader = None
+        
+        # Whether the loaded blocklists have been published; until then the
+        # sets do not hold the files' contents and must not be saved
+        self._blocklists_loaded = False
+        
+        # Guards blocklist changes against the background load publishing
+        self._blocklist_lock = threading.Lock()
+        
+        # Blocklist types with unsaved changes
+        self._dirty = set()
+        
+        # Delay before changed blocklists are written to disk (ms)
+        self._flush_delay = 500
+        
         # Content filters
         self.content_filters = {}
         
@@ -37,11 +214,19 @@ class ContentSecurityManager(QObject):
         """Initialize the content security manager."""
         self.app_controller.logger.info("Initializing content security manager...")
         
-        # Load blocklists
-        self._load_blocklists()
+        # Bind blocklist hit handlers
+        self._bind_dispatch()
         
-        # Register default content filters
-        self._register_default_filters()
+        # Save pending blocklist changes even if cleanup is skipped on exit
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+        
+        # Load blocklists in the background so startup is not held up;
+        # URLs are allowed until the index is published
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="blocklists")
+        self._loader = executor.submit(self._load_blocklists)
+        executor.shutdown(wait=False)
         
         # Update state
         self.initialized = True
@@ -54,11 +239,22 @@ class ContentSecurityManager(QObject):
         """Clean up the content security manager."""
         self.app_controller.logger.info("Cleaning up content security manager...")
         
-        # Clear blocklists
+        # Wait for a blocklist load still in progress
+        if self._loader:
+            self._loader.result()
+            self._loader = None
+        
+        # Save pending blocklist changes
+        self.flush()
+        
+        # Clear blocklists; the empty sets must never be saved
+        self._blocklists_loaded = False
         self.malware_domains.clear()
         self.phishing_domains.clear()
         self.ad_domains.clear()
         self.tracker_domains.clear()
+        self._trie = DomainTrie(self._get_blocklists())
+        self._dispatch = {}
         
         # Clear content filters
         self.content_filters.clear()
@@ -77,48 +273,106 @@ class ContentSecurityManager(QObject):
             blocklists_dir = os.path.expanduser("~/.nebulafusion/blocklists")
             os.makedirs(blocklists_dir, exist_ok=True)
             
-            # Load malware domains
-            malware_path = os.path.join(blocklists_dir, "malware.txt")
-            if os.path.exists(malware_path):
-                with open(malware_path, "r") as f:
-                    self.malware_domains = set(line.strip() for line in f if line.strip())
-            
-            # Load phishing domains
-            phishing_path = os.path.join(blocklists_dir, "phishing.txt")
-            if os.path.exists(phishing_path):
-                with open(phishing_path, "r") as f:
-                    self.phishing_domains = set(line.strip() for line in f if line.strip())
-            
-            # Load ad domains
-            ad_path = os.path.join(blocklists_dir, "ads.txt")
-            if os.path.exists(ad_path):
-                with open(ad_path, "r") as f:
-                    self.ad_domains = set(line.strip() for line in f if line.strip())
-            
-            # Load tracker domains
-            tracker_path = os.path.join(blocklists_dir, "trackers.txt")
-            if os.path.exists(tracker_path):
-                with open(tracker_path, "r") as f:
-                    self.tracker_domains = set(line.strip() for line in f if line.strip())
+            # Load the four independent blocklist files concurrently
+            blocklist_files = {
+                "malware_domains": "malware.txt",
+                "phishing_domains": "phishing.txt",
+                "ad_domains": "ads.txt",
+                "tracker_domains": "trackers.txt"
+            }
+            with ThreadPoolExecutor(max_workers=len(blocklist_files)) as executor:
+                futures = {}
+                for attr, filename in blocklist_files.items():
+                    path = os.path.join(blocklists_dir, filename)
+                    if os.path.exists(path):
+                        futures[attr] = executor.submit(self._read_domains, path)
+            
+            # Edits wait for this load, so the sets can simply be replaced
+            results = {attr: future.result() for attr, future in futures.items()}
+            with self._blocklist_lock:
+                for attr, domains in results.items():
+                    setattr(self, attr, domains)
+                
+                # Build lookup index; readers see the old or the new trie,
+                # never a partly built one
+                self._rebuild_index()
+                self._blocklists_loaded = True
             
             self.app_controller.logger.info(f"Loaded blocklists: {len(self.malware_domains)} malware, {len(self.phishing_domains)} phishing, {len(self.ad_domains)} ads, {len(self.tracker_domains)} trackers")
+            
+            # Emit signal
+            self.blocklists_loaded.emit()
         
         except Exception as e:
             self.app_controller.logger.error(f"Error loading blocklists: {e}")
     
-    def _register_default_filters(self):
-        """Register default content filters."""
-        # Register malware filter
-        self.register_content_filter("malware", self._filter_malware)
+    def _wait_for_load(self):
+        """Wait for the background blocklist load to publish its results."""
+        # Edits made earlier would be lost when the load replaces the sets,
+        # and saving them would replace the files with only the changes
+        loader = self._loader
+        if loader is not None:
+            loader.result()
+    
+    def _read_domains(self, path):
+        """Read a blocklist file into a set of domains, skipping comments."""
+        domains = set()
+        with open(path, "rb") as f:
+            # Empty files cannot be memory-mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                return domains
+            
+            # Scan the mapped file, decoding only accepted lines
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    line = line.strip()
+                    if line and not line.startswith(b"#"):
+                        domains.add(line.decode("utf-8"))
         
-        # Register phishing filter
-        self.register_content_filter("phishing", self._filter_phishing)
+        return domains
+    
+    def _get_blocklists(self):
+        """Get blocklists by type, highest precedence first."""
+        return {
+            "malware": self.malware_domains,
+            "phishing": self.phishing_domains,
+            "ads": self.ad_domains,
+            "trackers": self.tracker_domains
+        }
+    
+    def _rebuild_index(self):
+        """Rebuild the lookup trie from the blocklists."""
+        # Insert lowest precedence first so higher types win on duplicates
+        precedence = tuple(self._get_blocklists())
+        blocklists = reversed(self._get_blocklists().items())
         
-        # Register ad filter
-        self.register_content_filter("ads", self._filter_ads)
+        if marisa_trie is not None:
+            self._trie = CompactDomainTrie(blocklists, precedence)
+            return
         
-        # Register tracker filter
-        self.register_content_filter("trackers", self._filter_trackers)
+        trie = DomainTrie(precedence)
+        for blocklist_type, blocklist in blocklists:
+            for domain in blocklist:
+                trie.add(domain, blocklist_type)
+        
+        self._trie = trie
+    
+    def _index_domain(self, domain):
+        """Update the lookup trie for a single domain."""
+        for blocklist_type, blocklist in self._get_blocklists().items():
+            if domain in blocklist:
+                self._trie.add(domain, blocklist_type)
+                return
+        self._trie.discard(domain)
+    
+    def _bind_dispatch(self):
+        """Resolve the signal, hook trigger and logger for each blocklist type once."""
+        trigger_hook = self.app_controller.hook_registry.trigger_hook
+        logger = self.app_controller.logger
+        self._dispatch = {
+            blocklist_type: (getattr(self, signal).emit, trigger_hook, hook, reason, getattr(logger, level), message)
+            for blocklist_type, (signal, hook, reason, level, message) in self._DISPATCH.items()
+        }
     
     def register_content_filter(self, filter_id, filter_func):
         """Register a content filter."""
@@ -139,7 +393,16 @@ class ContentSecurityManager(QObject):
         # Get URL domain
         domain = self._get_domain(url)
         
-        # Check all filters
+        # Check blocklists with a single lookup
+        blocklist_type = self._trie.lookup(domain)
+        if blocklist_type is not None:
+            emit, trigger_hook, hook, reason, log, message = self._dispatch[blocklist_type]
+            emit(url, reason)
+            trigger_hook(hook, url, reason)
+            log(f"{message}: {url}")
+            return False, blocklist_type
+        
+        # Check registered filters
         for filter_id, filter_func in self.content_filters.items():
             result = filter_func(url, domain)
             if result:
@@ -147,56 +410,11 @@ class ContentSecurityManager(QObject):
         
         return True, None
     
-    def _filter_malware(self, url, domain):
-        """Filter malware domains."""
-        if domain in self.malware_domains:
-            self.threat_detected.emit(url, "malware")
-            self.app_controller.hook_registry.trigger_hook("onThreatDetected", url, "malware")
-            self.app_controller.logger.warning(f"Malware detected: {url}")
-            return True
-        return False
-    
-    def _filter_phishing(self, url, domain):
-        """Filter phishing domains."""
-        if domain in self.phishing_domains:
-            self.threat_detected.emit(url, "phishing")
-            self.app_controller.hook_registry.trigger_hook("onThreatDetected", url, "phishing")
-            self.app_controller.logger.warning(f"Phishing detected: {url}")
-            return True
-        return False
-    
-    def _filter_ads(self, url, domain):
-        """Filter ad domains."""
-        if domain in self.ad_domains:
-            self.content_blocked.emit(url, "ad")
-            self.app_controller.hook_registry.trigger_hook("onContentBlocked", url, "ad")
-            self.app_controller.logger.info(f"Ad blocked: {url}")
-            return True
-        return False
-    
-    def _filter_trackers(self, url, domain):
-        """Filter tracker domains."""
-        if domain in self.tracker_domains:
-            self.content_blocked.emit(url, "tracker")
-            self.app_controller.hook_registry.trigger_hook("onContentBlocked", url, "tracker")
-            self.app_controller.logger.info(f"Tracker blocked: {url}")
-            return True
-        return False
-    
     def _get_domain(self, url):
         """Get domain from URL."""
         try:
-            # Parse URL
-            qurl = QUrl(url)
-            
-            # Get domain
-            domain = qurl.host()
-            
-            # Remove www prefix
-            if domain.startswith("www."):
-                domain = domain[4:]
-            
-            return domain
+            # Pages request many URLs from the same few hosts
+            return _url_domain(url)
         
         except Exception as e:
             self.app_controller.logger.error(f"Error getting domain from URL: {e}")
@@ -205,21 +423,27 @@ class ContentSecurityManager(QObject):
     def add_to_blocklist(self, domain, blocklist_type):
         """Add a domain to a blocklist."""
         try:
-            # Check blocklist type
-            if blocklist_type == "malware":
-                self.malware_domains.add(domain)
-            elif blocklist_type == "phishing":
-                self.phishing_domains.add(domain)
-            elif blocklist_type == "ads":
-                self.ad_domains.add(domain)
-            elif blocklist_type == "trackers":
-                self.tracker_domains.add(domain)
-            else:
-                self.app_controller.logger.warning(f"Unknown blocklist type: {blocklist_type}")
-                return False
+            self._wait_for_load()
             
-            # Save blocklist
-            self._save_blocklist(blocklist_type)
+            with self._blocklist_lock:
+                # Check blocklist type
+                if blocklist_type == "malware":
+                    self.malware_domains.add(domain)
+                elif blocklist_type == "phishing":
+                    self.phishing_domains.add(domain)
+                elif blocklist_type == "ads":
+                    self.ad_domains.add(domain)
+                elif blocklist_type == "trackers":
+                    self.tracker_domains.add(domain)
+                else:
+                    self.app_controller.logger.warning(f"Unknown blocklist type: {blocklist_type}")
+                    return False
+                
+                # Update lookup index
+                self._index_domain(domain)
+            
+            # Save blocklist after a short delay
+            self._schedule_save(blocklist_type)
             
             self.app_controller.logger.info(f"Added {domain} to {blocklist_type} blocklist")
             
@@ -232,21 +456,27 @@ class ContentSecurityManager(QObject):
     def remove_from_blocklist(self, domain, blocklist_type):
         """Remove a domain from a blocklist."""
         try:
-            # Check blocklist type
-            if blocklist_type == "malware":
-                self.malware_domains.discard(domain)
-            elif blocklist_type == "phishing":
-                self.phishing_domains.discard(domain)
-            elif blocklist_type == "ads":
-                self.ad_domains.discard(domain)
-            elif blocklist_type == "trackers":
-                self.tracker_domains.discard(domain)
-            else:
-                self.app_controller.logger.warning(f"Unknown blocklist type: {blocklist_type}")
-                return False
+            self._wait_for_load()
             
-            # Save blocklist
-            self._save_blocklist(blocklist_type)
+            with self._blocklist_lock:
+                # Check blocklist type
+                if blocklist_type == "malware":
+                    self.malware_domains.discard(domain)
+                elif blocklist_type == "phishing":
+                    self.phishing_domains.discard(domain)
+                elif blocklist_type == "ads":
+                    self.ad_domains.discard(domain)
+                elif blocklist_type == "trackers":
+                    self.tracker_domains.discard(domain)
+                else:
+                    self.app_controller.logger.warning(f"Unknown blocklist type: {blocklist_type}")
+                    return False
+                
+                # Update lookup index
+                self._index_domain(domain)
+            
+            # Save blocklist after a short delay
+            self._schedule_save(blocklist_type)
             
             self.app_controller.logger.info(f"Removed {domain} from {blocklist_type} blocklist")
             
@@ -256,9 +486,27 @@ class ContentSecurityManager(QObject):
             self.app_controller.logger.error(f"Error removing from blocklist: {e}")
             return False
     
+    def _schedule_save(self, blocklist_type):
+        """Mark a blocklist as changed and schedule a save."""
+        if not self._dirty:
+            QTimer.singleShot(self._flush_delay, self.flush)
+        self._dirty.add(blocklist_type)
+    
+    def flush(self):
+        """Save blocklists with pending changes."""
+        self._wait_for_load()
+        for blocklist_type in self._dirty:
+            self._save_blocklist(blocklist_type)
+        self._dirty.clear()
+    
     def _save_blocklist(self, blocklist_type):
         """Save a blocklist."""
         try:
+            # Never replace a file with a blocklist that was not loaded from it
+            if not self._blocklists_loaded:
+                self.app_controller.logger.warning(f"Blocklists not loaded; not saving {blocklist_type} blocklist")
+                return False
+            
             # Create blocklists directory
             blocklists_dir = os.path.expanduser("~/.nebulafusion/blocklists")
             os.makedirs(blocklists_dir, exist_ok=True)
@@ -280,11 +528,21 @@ class ContentSecurityManager(QObject):
                 self.app_controller.logger.warning(f"Unknown blocklist type: {blocklist_type}")
                 return False
             
-            # Save blocklist
+            # Save blocklist to a temporary file, then swap it in so a
+            # failed write never leaves a truncated blocklist behind
             path = os.path.join(blocklists_dir, filename)
-            with open(path, "w") as f:
-                for domain in sorted(blocklist):
-                    f.write(f"{domain}\n")
+            # Order does not matter to the loader, so skip sorting
+            data = "".join(f"{domain}\n" for domain in blocklist).encode("utf-8")
+            fd, tmp_path = self._create_temp_file(path)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
             
             return True
         
@@ -292,6 +550,34 @@ class ContentSecurityManager(QObject):
             self.app_controller.logger.error(f"Error saving blocklist: {e}")
             return False
     
+    @staticmethod
+    def _create_temp_file(path):
+        """
+        Create a new temporary file next to path and return (fd, tmp_path).
+        Unlike mkstemp, which always uses 0600, the file gets the mode of an
+        existing file at path, or the umask-default mode for a new one.
+        """
+        flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0)
+        while True:
+            tmp_path = f"{path}.{os.urandom(4).hex()}.tmp"
+            try:
+                # The umask applies to the requested mode
+                fd = os.open(tmp_path, flags, 0o666)
+                break
+            except FileExistsError:
+                continue
+        
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o777)
+        except FileNotFoundError:
+            pass
+        except BaseException:
+            os.close(fd)
+            os.unlink(tmp_path)
+            raise
+        
+        return fd, tmp_path
+    
     def import_blocklist(self, file_path, blocklist_type):
         """Import a blocklist from a file."""
         try:
@@ -300,13 +586,24 @@ class ContentSecurityManager(QObject):
                 self.app_controller.logger.warning(f"File not found: {file_path}")
                 return False
             
+            # Check blocklist type
+            if blocklist_type not in self._get_blocklists():
+                self.app_controller.logger.warning(f"Unknown blocklist type: {blocklist_type}")
+                return False
+            
             # Read domains
-            with open(file_path, "r") as f:
-                domains = set(line.strip() for line in f if line.strip())
+            domains = self._read_domains(file_path)
             
-            # Add domains to blocklist
-            for domain in domains:
-                self.add_to_blocklist(domain, blocklist_type)
+            self._wait_for_load()
+            with self._blocklist_lock:
+                # Add domains to blocklist in one batch
+                self._get_blocklists()[blocklist_type].update(domains)
+                
+                # Update lookup index
+                self._rebuild_index()
+            
+            # Save blocklist once
+            self._save_blocklist(blocklist_type)
             
             self.app_controller.logger.info(f"Imported {len(domains)} domains to {blocklist_type} blocklist")
             
@@ -319,6 +616,8 @@ class ContentSecurityManager(QObject):
     def export_blocklist(self, file_path, blocklist_type):
         """Export a blocklist to a file."""
         try:
+            self._wait_for_load()
+            
             # Get blocklist
             if blocklist_type == "malware":
                 blocklist = self.malware_domains
@@ -351,18 +650,24 @@ class ContentSecurityManager(QObject):
     def clear_blocklist(self, blocklist_type):
         """Clear a blocklist."""
         try:
-            # Check blocklist type
-            if blocklist_type == "malware":
-                self.malware_domains.clear()
-            elif blocklist_type == "phishing":
-                self.phishing_domains.clear()
-            elif blocklist_type == "ads":
-                self.ad_domains.clear()
-            elif blocklist_type == "trackers":
-                self.tracker_domains.clear()
-            else:
-                self.app_controller.logger.warning(f"Unknown blocklist type: {blocklist_type}")
-                return False
+            self._wait_for_load()
+            
+            with self._blocklist_lock:
+                # Check blocklist type
+                if blocklist_type == "malware":
+                    self.malware_domains.clear()
+                elif blocklist_type == "phishing":
+                    self.phishing_domains.clear()
+                elif blocklist_type == "ads":
+                    self.ad_domains.clear()
+                elif blocklist_type == "trackers":
+                    self.tracker_domains.clear()
+                else:
+                    self.app_controller.logger.warning(f"Unknown blocklist type: {blocklist_type}")
+                    return False
+                
+                # Update lookup index
+                self._rebuild_index()
             
             # Save blocklist
             self._save_blocklist(blocklist_type)
@@ -5,6 +5,18 @@ import os
 from PyQt6.QtCore import QObject, pyqtSignal
 
 
+# Cookie filters are called from C++ for every cookie, so they are plain
+# module-level functions that read a single attribute
+def _first_party_only(request):
+    """Allow only first-party cookies."""
+    return not request.thirdParty
+
+
+def _allow_all(request):
+    """Allow all cookies."""
+    return True
+
+
 class CookiesManager(QObject):
     """
     Manager for browser cookies.
@@ -168,14 +180,10 @@ class CookiesManager(QObject):
             
             # Set cookie filter
             if block:
-                def filter_func(request):
-                    """Allow only first-party cookies."""
-                    return not request.thirdParty
-
-                cookie_store.setCookieFilter(filter_func)
+                cookie_store.setCookieFilter(_first_party_only)
             else:
                 # Allow all cookies
-                cookie_store.setCookieFilter(lambda request: True)
+                cookie_store.setCookieFilter(_allow_all)
             
             # Trigger hook
             self.app_controller.hook_registry.trigger_hook("onThirdPartyCookiesBlocked", block, profile_name)
@@ -6,7 +6,11 @@ import sys
 import json
 import sqlite3
 import time
-from PyQt6.QtCore import QObject, pyqtSignal, QUrl
+import itertools
+import functools
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal, QUrl, QTimer, QCoreApplication
 from PyQt6.QtWebEngineCore import QWebEngineDownloadRequest
 
 class DownloadManager(QObject):
@@ -22,6 +26,67 @@ class DownloadManager(QObject):
     download_progress = pyqtSignal(str, int, int)  # download_id, received, total
     download_canceled = pyqtSignal(str)  # download_id
     
+    # Downloads transferring at once unless the max_concurrent_downloads setting says otherwise
+    _MAX_CONCURRENT_DOWNLOADS = 3
+    
+    # Columns of a download record, in table order
+    _COLUMNS = ("id", "url", "path", "filename", "mime_type", "size", "received",
+                "state", "start_time", "end_time", "error")
+    
+    # Fixed statements, so the sqlite3 statement cache reuses their prepared form
+    _INSERT_SQL = """
+    INSERT INTO downloads
+    (id, url, path, filename, mime_type, size, received, state, start_time, end_time, error)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _SELECT_SQL = """
+    SELECT id, url, path, filename, mime_type, size, received, state, start_time, end_time, error
+    FROM downloads
+    WHERE id = ?
+    """
+    _LIST_SQL = """
+    SELECT id, url, path, filename, mime_type, size, received, state, start_time, end_time, error
+    FROM downloads
+    ORDER BY start_time DESC, id DESC
+    LIMIT ? OFFSET ?
+    """
+    _LIST_BY_STATE_SQL = """
+    SELECT id, url, path, filename, mime_type, size, received, state, start_time, end_time, error
+    FROM downloads
+    WHERE state = ?
+    ORDER BY start_time DESC, id DESC
+    LIMIT ? OFFSET ?
+    """
+    # Keyset pages: rows listed after the (start_time, id) of the previous page's last row
+    _PAGE_SQL = """
+    SELECT id, url, path, filename, mime_type, size, received, state, start_time, end_time, error
+    FROM downloads
+    WHERE start_time <= ? AND (start_time < ? OR id < ?)
+    ORDER BY start_time DESC, id DESC
+    LIMIT ?
+    """
+    _PAGE_BY_STATE_SQL = """
+    SELECT id, url, path, filename, mime_type, size, received, state, start_time, end_time, error
+    FROM downloads
+    WHERE state = ? AND start_time <= ? AND (start_time < ? OR id < ?)
+    ORDER BY start_time DESC, id DESC
+    LIMIT ?
+    """
+    _UPDATE_PROGRESS_SQL = "UPDATE downloads SET received = ?, size = ? WHERE id = ?"
+    # Columns bound to NULL keep their stored value
+    _UPDATE_SQL = """
+    UPDATE downloads SET
+        received = COALESCE(?, received),
+        size = COALESCE(?, size),
+        state = COALESCE(?, state),
+        end_time = COALESCE(?, end_time),
+        error = COALESCE(?, error)
+    WHERE id = ?
+    """
+    _DELETE_SQL = "DELETE FROM downloads WHERE id = ?"
+    _CLEAR_SQL = "DELETE FROM downloads"
+    _CLEAR_BY_STATE_SQL = "DELETE FROM downloads WHERE state = ?"
+    
     def __init__(self, app_controller):
         """Initialize the download manager."""
         super().__init__()
@@ -30,9 +95,38 @@ class DownloadManager(QObject):
         # Database connection
         self.db_conn = None
         
+        # Single worker thread that owns all database I/O
+        self._db_executor = None
+        
+        # Updates collected during shutdown, written in one transaction
+        self._deferred_updates = None
+        
         # Active downloads
         self.active_downloads = {}
         
+        # Accepted downloads held paused until a transfer slot frees up, in arrival order
+        self._waiting = deque()
+        
+        # Rows of downloads running in this session; these are authoritative
+        # over the database, which only receives throttled progress
+        self._download_rows = {}
+        
+        # Resolved download directory, cleared when the setting changes
+        self._download_dir = None
+        
+        # Download IDs; seeded from the clock so they stay unique across sessions
+        self._id_counter = itertools.count(int(time.time() * 1000))
+        
+        # Latest unsaved progress per download, written together once per interval
+        self._pending_progress = {}
+        self._progress_interval = 500
+        
+        # Progress hooks fire at most once per interval per download,
+        # with the latest values delivered when the interval ends
+        self._hook_interval = 100
+        self._hook_last = {}
+        self._pending_hooks = {}
+        
         # Initialize downloads
         self.initialized = False
     
@@ -46,11 +140,34 @@ class DownloadManager(QObject):
         
         # Connect to database
         db_path = os.path.join(downloads_dir, "downloads.db")
-        self.db_conn = sqlite3.connect(db_path)
+        self.db_conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.db_conn.row_factory = sqlite3.Row
+        
+        # Use WAL so the frequent small commits need a single fsync
+        self.db_conn.execute("PRAGMA journal_mode=WAL")
+        self.db_conn.execute("PRAGMA synchronous=NORMAL")
+        self.db_conn.execute("PRAGMA temp_store=MEMORY")
+        self.db_conn.execute("PRAGMA cache_size=-8000")
+        self.db_conn.execute("PRAGMA mmap_size=67108864")
         
         # Create tables
         self._create_tables()
         
+        # Continue IDs after the newest stored download, so inserts never collide
+        last_id = self.db_conn.execute("SELECT MAX(CAST(id AS INTEGER)) FROM downloads").fetchone()[0]
+        self._id_counter = itertools.count(max(int(time.time() * 1000), (last_id or 0) + 1))
+        
+        # Keep database I/O off the GUI thread
+        self._db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="downloads-db")
+        
+        # Connect to settings manager
+        self.app_controller.settings_manager.setting_changed.connect(self._on_setting_changed)
+        
+        # Queue pending progress even if cleanup is skipped on exit
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush_progress)
+        
         # Update state
         self.initialized = True
         
@@ -62,9 +179,30 @@ class DownloadManager(QObject):
         """Clean up the download manager."""
         self.app_controller.logger.info("Cleaning up download manager...")
         
-        # Cancel active downloads
+        # Cancel active downloads, without starting queued ones in their place,
+        # and save their final states together
+        self._waiting.clear()
+        self._deferred_updates = []
         for download_id in list(self.active_downloads.keys()):
             self.cancel_download(download_id)
+        updates, self._deferred_updates = self._deferred_updates, None
+        
+        # QtWebEngine reports most cancellations later, if at all before exit,
+        # so mark every download still active as canceled here
+        end_time = int(time.time())
+        updates.extend((None, None, "canceled", end_time, None, download_id) for download_id in self.active_downloads)
+        self.active_downloads.clear()
+        if updates and self._db_executor:
+            self._run_db(self._write, self._UPDATE_SQL, updates, "Error updating downloads in database", True)
+        self._pending_progress.clear()
+        self._pending_hooks.clear()
+        self._hook_last.clear()
+        self._download_rows.clear()
+        
+        # Let queued database writes finish
+        if self._db_executor:
+            self._db_executor.shutdown(wait=True)
+            self._db_executor = None
         
         # Close database connection
         if self.db_conn:
@@ -80,72 +218,64 @@ class DownloadManager(QObject):
     
     def _create_tables(self):
         """Create database tables."""
-        # Create cursor
-        cursor = self.db_conn.cursor()
-        
-        # Create downloads table
-        cursor.execute("""
-        CREATE TABLE IF NOT EXISTS downloads (
-            id TEXT PRIMARY KEY,
-            url TEXT,
-            path TEXT,
-            filename TEXT,
-            mime_type TEXT,
-            size INTEGER,
-            received INTEGER,
-            state TEXT,
-            start_time INTEGER,
-            end_time INTEGER,
-            error TEXT
-        )
-        """)
-        
-        # Commit changes
-        self.db_conn.commit()
+        # Create tables and indexes in one transaction, committed on success
+        with self.db_conn:
+            # Create downloads table
+            self.db_conn.execute("""
+            CREATE TABLE IF NOT EXISTS downloads (
+                id TEXT PRIMARY KEY,
+                url TEXT,
+                path TEXT,
+                filename TEXT,
+                mime_type TEXT,
+                size INTEGER,
+                received INTEGER,
+                state TEXT,
+                start_time INTEGER,
+                end_time INTEGER,
+                error TEXT
+            )
+            """)
+            
+            # Create indexes for listing downloads by state and by start time
+            self.db_conn.execute("CREATE INDEX IF NOT EXISTS idx_downloads_state_time ON downloads(state, start_time DESC)")
+            self.db_conn.execute("CREATE INDEX IF NOT EXISTS idx_downloads_time ON downloads(start_time DESC)")
     
     def handle_download(self, download):
         """Handle a download request."""
         try:
             # Generate download ID
-            download_id = str(int(time.time() * 1000))
+            download_id = str(next(self._id_counter))
             
             # Get download information
             url = download.url().toString()
             suggested_filename = download.suggestedFileName()
             
             # Get download directory
-            download_dir = self.app_controller.settings_manager.get_setting("download_directory")
-            if not download_dir:
-                download_dir = os.path.expanduser("~/Downloads")
+            download_dir = self._get_download_dir()
             
-            # Create download directory if it doesn't exist
-            os.makedirs(download_dir, exist_ok=True)
-            
-            # Set download path
-            download_path = os.path.join(download_dir, suggested_filename)
-            
-            # Check if file exists
-            if os.path.exists(download_path):
-                # Find a unique filename
-                base_name, ext = os.path.splitext(suggested_filename)
-                i = 1
-                while os.path.exists(download_path):
-                    new_filename = f"{base_name} ({i}){ext}"
-                    download_path = os.path.join(download_dir, new_filename)
-                    i += 1
+            # Set download path, using a unique filename
+            download_path = self._unique_path(download_dir, suggested_filename)
             
             # Set download path
             download.setDownloadDirectory(download_dir)
             download.setDownloadFileName(os.path.basename(download_path))
             
-            # Connect signals
-            download.isFinishedChanged.connect(lambda: self._on_download_finished(download_id, download))
-            download.receivedBytesChanged.connect(lambda: self._on_download_progress(download_id, download))
-            download.stateChanged.connect(lambda: self._on_download_state_changed(download_id, download))
+            # Connect signals; partials bind the arguments without an extra Python frame per emit
+            download.isFinishedChanged.connect(functools.partial(self._on_download_finished, download_id, download))
+            download.receivedBytesChanged.connect(functools.partial(self._on_download_progress, download_id, download))
+            download.stateChanged.connect(functools.partial(self._on_download_state_changed, download_id, download))
             
             # Accept download
             download.accept()
             
+            # Hold the download back while every transfer slot is taken
+            state = "in_progress"
+            if len(self.active_downloads) - len(self._waiting) >= self._max_concurrent_downloads():
+                download.pause()
+                self._waiting.append(download_id)
+                state = "queued"
+            
             # Store download
             self.active_downloads[download_id] = download
             
@@ -158,7 +288,7 @@ class DownloadManager(QObject):
                 "",  # MIME type
                 0,  # Size
                 0,  # Received
-                "in_progress",
+                state,
                 int(time.time()),
                 0,  # End time
                 ""  # Error
@@ -170,7 +300,7 @@ class DownloadManager(QObject):
             # Trigger hook
             self.app_controller.hook_registry.trigger_hook("onDownloadStart", download_id, url, download_path)
             
-            self.app_controller.logger.info(f"Download started: {url} to {download_path}")
+            self.app_controller.logger.info(f"Download {'queued' if state == 'queued' else 'started'}: {url} to {download_path}")
 
             return download_id
 
@@ -178,34 +308,77 @@ class DownloadManager(QObject):
             self.app_controller.logger.error(f"Error handling download: {e}")
             return None
 
+    def _max_concurrent_downloads(self):
+        """Get the number of downloads allowed to transfer at once."""
+        return self.app_controller.settings_manager.get_setting(
+            "max_concurrent_downloads", self._MAX_CONCURRENT_DOWNLOADS
+        )
+    
+    def _start_next_download(self):
+        """Resume queued downloads while transfer slots are free."""
+        while self._waiting and len(self.active_downloads) - len(self._waiting) < self._max_concurrent_downloads():
+            download_id = self._waiting.popleft()
+            download = self.active_downloads.get(download_id)
+            if download is None:
+                continue
+            
+            download.resume()
+            self._update_download_in_db(download_id, state="in_progress")
+            self.app_controller.logger.info(f"Download dequeued: {download_id}")
+    
+    def _get_download_dir(self):
+        """Get the download directory, creating it on first use."""
+        if self._download_dir is None:
+            download_dir = self.app_controller.settings_manager.get_setting("download_directory")
+            if not download_dir:
+                download_dir = os.path.expanduser("~/Downloads")
+            
+            # Create download directory if it doesn't exist
+            os.makedirs(download_dir, exist_ok=True)
+            
+            self._download_dir = download_dir
+        
+        return self._download_dir
+    
+    def _on_setting_changed(self, key, value):
+        """Handle setting changed event."""
+        if key == "download_directory":
+            self._download_dir = None
+    
+    def _unique_path(self, directory, filename):
+        """Return a path in directory that does not collide with an existing file."""
+        # List the directory once and probe candidates in memory
+        try:
+            existing = set(os.listdir(directory))
+        except OSError:
+            existing = set()
+        
+        name = filename
+        base_name, ext = os.path.splitext(filename)
+        i = 1
+        while name in existing:
+            name = f"{base_name} ({i}){ext}"
+            i += 1
+        
+        return os.path.join(directory, name)
+    
     def download_url(self, url, path=None):
         """Download a file from a URL using a background thread."""
         import threading
         import requests
 
         try:
-            download_id = str(int(time.time() * 1000))
+            download_id = str(next(self._id_counter))
 
             # Determine download directory
-            download_dir = self.app_controller.settings_manager.get_setting(
-                "download_directory"
-            )
-            if not download_dir:
-                download_dir = os.path.expanduser("~/Downloads")
-            os.makedirs(download_dir, exist_ok=True)
+            download_dir = self._get_download_dir()
 
             if path is None:
                 filename = os.path.basename(QUrl(url).fileName()) or "download"
                 path = os.path.join(download_dir, filename)
 
             # Ensure unique filename
-            base, ext = os.path.splitext(os.path.basename(path))
-            unique_path = path
-            i = 1
-            while os.path.exists(unique_path):
-                unique_path = os.path.join(download_dir, f"{base} ({i}){ext}")
-                i += 1
-            path = unique_path
+            path = self._unique_path(os.path.dirname(path) or download_dir, os.path.basename(path))
 
             def run():
                 received = 0
@@ -235,18 +408,27 @@ class DownloadManager(QObject):
                         "onDownloadStart", download_id, url, path
                     )
 
+                    interval = self._progress_interval / 1000
+                    hook_interval = self._hook_interval / 1000
+                    last_write = last_hook = time.monotonic()
                     with open(path, "wb") as f:
                         for chunk in response.iter_content(chunk_size=8192):
                             if chunk:
                                 f.write(chunk)
                                 received += len(chunk)
-                                self._update_download_in_db(
-                                    download_id, received=received, size=total
-                                )
+                                self._download_rows[download_id]["received"] = received
+                                now = time.monotonic()
+                                if now - last_write >= interval:
+                                    self._update_download_in_db(
+                                        download_id, received=received, size=total
+                                    )
+                                    last_write = now
                                 self.download_progress.emit(download_id, received, total)
-                                self.app_controller.hook_registry.trigger_hook(
-                                    "onDownloadProgress", download_id, received, total
-                                )
+                                if now - last_hook >= hook_interval:
+                                    self.app_controller.hook_registry.trigger_hook(
+                                        "onDownloadProgress", download_id, received, total
+                                    )
+                                    last_hook = now
 
                     self._update_download_in_db(
                         download_id,
@@ -255,6 +437,7 @@ class DownloadManager(QObject):
                         received=received,
                         size=total,
                     )
+                    self._download_rows.pop(download_id, None)
                     if download_id in self.active_downloads:
                         del self.active_downloads[download_id]
 
@@ -273,6 +456,7 @@ class DownloadManager(QObject):
                         end_time=int(time.time()),
                         error=str(e),
                     )
+                    self._download_rows.pop(download_id, None)
                     self.download_failed.emit(download_id, str(e))
                     self.app_controller.hook_registry.trigger_hook(
                         "onDownloadError", download_id, str(e)
@@ -286,60 +470,65 @@ class DownloadManager(QObject):
             self.app_controller.logger.error(f"Error starting download: {e}")
             return None
     
-    def _add_download_to_db(self, download_id, url, path, filename, mime_type, size, received, state, start_time, end_time, error):
-        """Add a download to the database."""
+    def _run_db(self, func, *args):
+        """
+        Run a call on the database thread and return its Future.
+        
+        Once the manager is cleaned up the call is skipped and the Future
+        resolves to None, so late callers such as download worker threads
+        see a failed write instead of an exception.
+        """
+        executor = self._db_executor
+        if executor is not None:
+            try:
+                return executor.submit(func, *args)
+            except RuntimeError:
+                # Shut down between the check and the submit
+                pass
+        
+        self.app_controller.logger.warning("Download database is closed; skipping database call")
+        future = Future()
+        future.set_result(None)
+        return future
+    
+    def _write(self, sql, params, error_message, many=False):
+        """Execute and commit a write statement on the database thread."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
-            # Add download
-            cursor.execute("""
-            INSERT OR REPLACE INTO downloads
-            (id, url, path, filename, mime_type, size, received, state, start_time, end_time, error)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (download_id, url, path, filename, mime_type, size, received, state, start_time, end_time, error))
-            
-            # Commit changes
-            self.db_conn.commit()
+            with self.db_conn:
+                if many:
+                    self.db_conn.executemany(sql, params)
+                else:
+                    self.db_conn.execute(sql, params)
             
             return True
         
         except Exception as e:
-            self.app_controller.logger.error(f"Error adding download to database: {e}")
+            self.app_controller.logger.error(f"{error_message}: {e}")
             return False
     
-    def _update_download_in_db(self, download_id, **kwargs):
-        """Update a download in the database."""
-        try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
-            # Build update query
-            query = "UPDATE downloads SET "
-            params = []
-            
-            for key, value in kwargs.items():
-                query += f"{key} = ?, "
-                params.append(value)
-            
-            # Remove trailing comma and space
-            query = query[:-2]
-            
-            # Add where clause
-            query += " WHERE id = ?"
-            params.append(download_id)
-            
-            # Update download
-            cursor.execute(query, params)
-            
-            # Commit changes
-            self.db_conn.commit()
-            
-            return True
+    def _fetch(self, sql, params):
+        """Run a query on the database thread and return its rows."""
+        return self._run_db(lambda: self.db_conn.execute(sql, params).fetchall()).result() or []
+    
+    def _add_download_to_db(self, download_id, url, path, filename, mime_type, size, received, state, start_time, end_time, error):
+        """Queue a download to be added to the database."""
+        row = (download_id, url, path, filename, mime_type, size, received, state, start_time, end_time, error)
+        self._download_rows[download_id] = dict(zip(self._COLUMNS, row))
+        return self._run_db(self._write, self._INSERT_SQL, row, "Error adding download to database")
+    
+    def _update_download_in_db(self, download_id, received=None, size=None, state=None, end_time=None, error=None):
+        """Queue an update of a download in the database."""
+        row = self._download_rows.get(download_id)
+        if row is not None:
+            changes = {"received": received, "size": size, "state": state, "end_time": end_time, "error": error}
+            row.update((column, value) for column, value in changes.items() if value is not None)
+        
+        params = (received, size, state, end_time, error, download_id)
+        if self._deferred_updates is not None:
+            self._deferred_updates.append(params)
+            return None
         
-        except Exception as e:
-            self.app_controller.logger.error(f"Error updating download in database: {e}")
-            return False
+        return self._run_db(self._write, self._UPDATE_SQL, params, "Error updating download in database")
     
     def _on_download_finished(self, download_id, download):
         """Handle download finished event."""
@@ -348,24 +537,34 @@ class DownloadManager(QObject):
             if not download.isFinished():
                 return
             
-            # Get download information
-            path = download.downloadDirectory() + "/" + download.downloadFileName()
+            # Get download information; the path was resolved when the download was accepted
+            row = self._download_rows.get(download_id)
+            if row is not None:
+                path = row["path"]
+            else:
+                path = os.path.join(download.downloadDirectory(), download.downloadFileName())
+            success = download.state() == QWebEngineDownloadRequest.DownloadState.DownloadCompleted
+            
+            # Deliver the last progress to plugins; the final update
+            # below supersedes any pending progress write
+            self._trigger_progress_hook(download_id)
+            self._forget_progress(download_id)
             
             # Update database
             self._update_download_in_db(
                 download_id,
-                state="completed" if download.state() == QWebEngineDownloadRequest.DownloadState.DownloadCompleted else "canceled",
+                state="completed" if success else "canceled",
                 end_time=int(time.time()),
                 received=download.receivedBytes(),
                 size=download.totalBytes()
             )
             
-            # Remove from active downloads
+            # Remove from active downloads and start the next queued one
             if download_id in self.active_downloads:
                 del self.active_downloads[download_id]
+            self._start_next_download()
             
             # Emit signal
-            success = download.state() == QWebEngineDownloadRequest.DownloadState.DownloadCompleted
             self.download_finished.emit(download_id, success)
             
             # Trigger hook
@@ -383,30 +582,79 @@ class DownloadManager(QObject):
             received = download.receivedBytes()
             total = download.totalBytes()
             
-            # Update database
-            self._update_download_in_db(
-                download_id,
-                received=received,
-                size=total
-            )
+            # Update the in-memory row
+            row = self._download_rows.get(download_id)
+            if row is not None:
+                row["received"] = received
+                row["size"] = total
+            
+            # Schedule a database update; only the latest values are written
+            if not self._pending_progress:
+                QTimer.singleShot(self._progress_interval, self.flush_progress)
+            self._pending_progress[download_id] = (received, total)
             
             # Emit signal
             self.download_progress.emit(download_id, received, total)
             
-            # Trigger hook
-            self.app_controller.hook_registry.trigger_hook("onDownloadProgress", download_id, received, total)
+            # Trigger hook, throttled so plugins see at most one call per interval
+            now = time.monotonic()
+            elapsed = now - self._hook_last.get(download_id, 0)
+            if elapsed >= self._hook_interval / 1000:
+                self._hook_last[download_id] = now
+                self._pending_hooks.pop(download_id, None)
+                self.app_controller.hook_registry.trigger_hook("onDownloadProgress", download_id, received, total)
+            else:
+                if download_id not in self._pending_hooks:
+                    delay = self._hook_interval - int(elapsed * 1000)
+                    QTimer.singleShot(delay, lambda: self._trigger_progress_hook(download_id))
+                self._pending_hooks[download_id] = (received, total)
         
         except Exception as e:
             self.app_controller.logger.error(f"Error handling download progress: {e}")
     
-    def _on_download_state_changed(self, download_id, download):
+    def _trigger_progress_hook(self, download_id):
+        """Trigger the progress hook with the latest values held back by the throttle."""
+        progress = self._pending_hooks.pop(download_id, None)
+        if progress is None:
+            return
+        
+        received, total = progress
+        self._hook_last[download_id] = time.monotonic()
+        self.app_controller.hook_registry.trigger_hook("onDownloadProgress", download_id, received, total)
+    
+    def _forget_progress(self, download_id):
+        """Drop in-memory state of a download that is no longer running."""
+        if download_id in self._waiting:
+            self._waiting.remove(download_id)
+        self._download_rows.pop(download_id, None)
+        self._pending_progress.pop(download_id, None)
+        self._pending_hooks.pop(download_id, None)
+        self._hook_last.pop(download_id, None)
+    
+    def flush_progress(self):
+        """Queue pending progress of all downloads as a single transaction."""
+        if not self._pending_progress or not self._db_executor:
+            self._pending_progress.clear()
+            return None
+        
+        params = [(received, total, download_id)
+                  for download_id, (received, total) in self._pending_progress.items()]
+        self._pending_progress.clear()
+        
+        return self._run_db(self._write, self._UPDATE_PROGRESS_SQL, params, "Error saving download progress", True)
+    
+    def _on_download_state_changed(self, download_id, download, state=None):
         """Handle download state changed event."""
         try:
-            # Get download state
-            state = download.state()
+            # Get download state, unless the signal delivered it
+            if state is None:
+                state = download.state()
             
             # Handle state
             if state == QWebEngineDownloadRequest.DownloadState.DownloadCancelled:
+                # Drop pending progress
+                self._forget_progress(download_id)
+                
                 # Update database
                 self._update_download_in_db(
                     download_id,
@@ -414,9 +662,10 @@ class DownloadManager(QObject):
                     end_time=int(time.time())
                 )
                 
-                # Remove from active downloads
+                # Remove from active downloads and start the next queued one
                 if download_id in self.active_downloads:
                     del self.active_downloads[download_id]
+                self._start_next_download()
                 
                 # Emit signal
                 self.download_canceled.emit(download_id)
@@ -430,6 +679,9 @@ class DownloadManager(QObject):
                 # Get error
                 error = "Download interrupted"
                 
+                # Drop pending progress
+                self._forget_progress(download_id)
+                
                 # Update database
                 self._update_download_in_db(
                     download_id,
@@ -438,9 +690,10 @@ class DownloadManager(QObject):
                     error=error
                 )
                 
-                # Remove from active downloads
+                # Remove from active downloads and start the next queued one
                 if download_id in self.active_downloads:
                     del self.active_downloads[download_id]
+                self._start_next_download()
                 
                 # Emit signal
                 self.download_failed.emit(download_id, error)
@@ -487,6 +740,9 @@ class DownloadManager(QObject):
             # Pause download
             download.pause()
             
+            # Save progress so far
+            self.flush_progress()
+            
             # Update database
             self._update_download_in_db(
                 download_id,
@@ -515,7 +771,9 @@ class DownloadManager(QObject):
             # Get download
             download = self.active_downloads[download_id]
             
-            # Resume download
+            # Resume download; a queued download resumed by hand skips the queue
+            if download_id in self._waiting:
+                self._waiting.remove(download_id)
             download.resume()
             
             # Update database
@@ -538,112 +796,81 @@ class DownloadManager(QObject):
     def get_download(self, download_id):
         """Get a download."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
+            # Running downloads are served from memory
+            row = self._download_rows.get(download_id)
+            if row is not None:
+                return dict(row)
             
             # Get download
-            cursor.execute("""
-            SELECT id, url, path, filename, mime_type, size, received, state, start_time, end_time, error
-            FROM downloads
-            WHERE id = ?
-            """, (download_id,))
+            rows = self._fetch(self._SELECT_SQL, (download_id,))
             
-            # Get result
-            result = cursor.fetchone()
-            
-            if not result:
+            if not rows:
                 return None
             
             # Convert to dictionary
-            download = {
-                "id": result[0],
-                "url": result[1],
-                "path": result[2],
-                "filename": result[3],
-                "mime_type": result[4],
-                "size": result[5],
-                "received": result[6],
-                "state": result[7],
-                "start_time": result[8],
-                "end_time": result[9],
-                "error": result[10]
-            }
-            
-            return download
+            return dict(rows[0])
         
         except Exception as e:
             self.app_controller.logger.error(f"Error getting download: {e}")
             return None
     
     def get_downloads(self, limit=100, offset=0, state=None):
-        """Get downloads."""
+        """Get downloads, newest first."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
-            # Build query
-            query = """
-            SELECT id, url, path, filename, mime_type, size, received, state, start_time, end_time, error
-            FROM downloads
-            """
-            
-            params = []
+            # Get downloads; large offsets skip rows one by one, so
+            # get_downloads_after is the better way to page through history
+            if state:
+                rows = self._fetch(self._LIST_BY_STATE_SQL, (state, limit, offset))
+            else:
+                rows = self._fetch(self._LIST_SQL, (limit, offset))
             
+            return self._rows_to_downloads(rows)
+        
+        except Exception as e:
+            self.app_controller.logger.error(f"Error getting downloads: {e}")
+            return []
+    
+    def get_downloads_after(self, before_time, before_id="", limit=100, state=None):
+        """Get the downloads listed after the given start time and id, newest first."""
+        try:
+            # Get downloads, seeking through the start time index; pass the
+            # previous page's last download, or only a time to start before it
             if state:
-                query += "WHERE state = ? "
-                params.append(state)
-            
-            query += "ORDER BY start_time DESC "
-            query += "LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
-            
-            # Get downloads
-            cursor.execute(query, params)
-            
-            # Convert to list of dictionaries
-            downloads = []
-            for result in cursor.fetchall():
-                download = {
-                    "id": result[0],
-                    "url": result[1],
-                    "path": result[2],
-                    "filename": result[3],
-                    "mime_type": result[4],
-                    "size": result[5],
-                    "received": result[6],
-                    "state": result[7],
-                    "start_time": result[8],
-                    "end_time": result[9],
-                    "error": result[10]
-                }
-                downloads.append(download)
-            
-            return downloads
+                rows = self._fetch(self._PAGE_BY_STATE_SQL, (state, before_time, before_time, before_id, limit))
+            else:
+                rows = self._fetch(self._PAGE_SQL, (before_time, before_time, before_id, limit))
+            
+            return self._rows_to_downloads(rows)
         
         except Exception as e:
             self.app_controller.logger.error(f"Error getting downloads: {e}")
             return []
     
+    def _rows_to_downloads(self, rows):
+        """Convert database rows to dictionaries, preferring in-memory rows."""
+        downloads = []
+        for result in rows:
+            row = self._download_rows.get(result["id"])
+            downloads.append(dict(row if row is not None else result))
+        
+        return downloads
+    
     def clear_downloads(self, state=None):
         """Clear downloads from the database."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
-            # Build query
-            query = "DELETE FROM downloads "
-            
-            params = []
-            
+            # Clear downloads
             if state:
-                query += "WHERE state = ?"
-                params.append(state)
+                cleared = self._run_db(self._write, self._CLEAR_BY_STATE_SQL, (state,), "Error clearing downloads")
+            else:
+                cleared = self._run_db(self._write, self._CLEAR_SQL, (), "Error clearing downloads")
             
-            # Clear downloads
-            cursor.execute(query, params)
+            if not cleared.result():
+                return False
             
-            # Commit changes
-            self.db_conn.commit()
+            # Forget cleared rows
+            for download_id, row in list(self._download_rows.items()):
+                if not state or row["state"] == state:
+                    del self._download_rows[download_id]
             
             # Trigger hook
             self.app_controller.hook_registry.trigger_hook("onDownloadsCleared", state)
@@ -663,17 +890,10 @@ class DownloadManager(QObject):
     def remove_download(self, download_id):
         """Remove a download from the database."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
             # Remove download
-            cursor.execute("""
-            DELETE FROM downloads
-            WHERE id = ?
-            """, (download_id,))
-            
-            # Commit changes
-            self.db_conn.commit()
+            if not self._run_db(self._write, self._DELETE_SQL, (download_id,), "Error removing download").result():
+                return False
+            self._download_rows.pop(download_id, None)
             
             # Trigger hook
             self.app_controller.hook_registry.trigger_hook("onDownloadRemoved", download_id)
@@ -686,62 +906,52 @@ class DownloadManager(QObject):
             self.app_controller.logger.error(f"Error removing download: {e}")
             return False
     
-    def get_active_downloads(self):
-        """Get active downloads."""
+    def remove_downloads(self, download_ids):
+        """Remove several downloads from the database in a single transaction."""
         try:
-            # Get downloads
-            downloads = self.get_downloads(state="in_progress")
+            download_ids = list(download_ids)
+            if not download_ids:
+                return True
+            
+            # Remove downloads
+            params = [(download_id,) for download_id in download_ids]
+            if not self._run_db(self._write, self._DELETE_SQL, params, "Error removing downloads", True).result():
+                return False
+            
+            for download_id in download_ids:
+                self._download_rows.pop(download_id, None)
+                
+                # Trigger hook
+                self.app_controller.hook_registry.trigger_hook("onDownloadRemoved", download_id)
+            
+            self.app_controller.logger.info(f"Downloads removed: {len(download_ids)}")
             
-            return downloads
+            return True
         
         except Exception as e:
-            self.app_controller.logger.error(f"Error getting active downloads: {e}")
-            return []
+            self.app_controller.logger.error(f"Error removing downloads: {e}")
+            return False
+    
+    def get_active_downloads(self):
+        """Get active downloads."""
+        return self.get_downloads(state="in_progress")
     
     def get_completed_downloads(self):
         """Get completed downloads."""
-        try:
-            # Get downloads
-            downloads = self.get_downloads(state="completed")
-            
-            return downloads
-        
-        except Exception as e:
-            self.app_controller.logger.error(f"Error getting completed downloads: {e}")
-            return []
+        return self.get_downloads(state="completed")
     
     def get_failed_downloads(self):
         """Get failed downloads."""
-        try:
-            # Get downloads
-            downloads = self.get_downloads(state="failed")
-            
-            return downloads
-        
-        except Exception as e:
-            self.app_controller.logger.error(f"Error getting failed downloads: {e}")
-            return []
+        return self.get_downloads(state="failed")
     
     def get_canceled_downloads(self):
         """Get canceled downloads."""
-        try:
-            # Get downloads
-            downloads = self.get_downloads(state="canceled")
-            
-            return downloads
-        
-        except Exception as e:
-            self.app_controller.logger.error(f"Error getting canceled downloads: {e}")
-            return []
+        return self.get_downloads(state="canceled")
     
     def get_paused_downloads(self):
         """Get paused downloads."""
-        try:
-            # Get downloads
-            downloads = self.get_downloads(state="paused")
-            
-            return downloads
-        
-        except Exception as e:
-            self.app_controller.logger.error(f"Error getting paused downloads: {e}")
-            return []
+        return self.get_downloads(state="paused")
+    
+    def get_queued_downloads(self):
+        """Get queued downloads."""
+        return self.get_downloads(state="queued")
@@ -5,7 +5,11 @@ import os
 import json
 import sqlite3
 import time
-from PyQt6.QtCore import QObject, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal, QTimer, QCoreApplication
+from src.utils.json_utils import json_dumps
+from src.utils.sqlite_utils import MMAP_SIZE, ReadConnectionPool, configure_connection
+
 
 class HistoryManager(QObject):
     """
@@ -17,6 +21,17 @@ class HistoryManager(QObject):
     history_added = pyqtSignal(str, str)  # url, title
     history_removed = pyqtSignal(str)  # url
     history_cleared = pyqtSignal()
+    history_exported = pyqtSignal()
+    
+    # Add a visit, or count another visit to a known URL
+    _UPSERT_SQL = """
+    INSERT INTO history (url, title, visit_time, visit_count)
+    VALUES (?, ?, ?, 1)
+    ON CONFLICT(url) DO UPDATE SET
+        title = excluded.title,
+        visit_time = excluded.visit_time,
+        visit_count = history.visit_count + 1
+    """
     
     def __init__(self, app_controller):
         """Initialize the history manager."""
@@ -26,9 +41,27 @@ class HistoryManager(QObject):
         # Database connection
         self.db_conn = None
         
+        # Read-only connections for query methods
+        self._read_pool = ReadConnectionPool()
+        
+        # Runs exports off the calling thread
+        self._io_executor = None
+        
+        # Whether the full-text search index is available
+        self._fts_enabled = False
+        
+        # Visits waiting to be written; visits arriving within the flush
+        # delay of the last write are saved together
+        self._pending_visits = []
+        self._flush_delay = 500
+        self._last_flush = 0.0
+        
         # Initialize history
         self.initialized = False
         
+        # Finish exports on this object's thread
+        self.history_exported.connect(self._on_history_exported)
+        
         # Private browsing mode
         self.private_mode = False
     
@@ -42,11 +75,25 @@ class HistoryManager(QObject):
         
         # Connect to database
         db_path = os.path.join(history_dir, "history.db")
-        self.db_conn = sqlite3.connect(db_path)
+        self.db_conn = sqlite3.connect(db_path, check_same_thread=False)
+        
+        # Use WAL, with the journal and cache settings shared by the manager databases
+        configure_connection(self.db_conn, mmap_size=MMAP_SIZE)
         
         # Create tables
         self._create_tables()
         
+        # Open read-only connections; WAL lets them read while visits are written
+        self._read_pool.open(db_path, mmap_size=MMAP_SIZE)
+        
+        # Start the export worker
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history-io")
+        
+        # Save pending visits even if cleanup is skipped on exit
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.flush)
+        
         # Update state
         self.initialized = True
         
@@ -58,8 +105,20 @@ class HistoryManager(QObject):
         """Clean up the history manager."""
         self.app_controller.logger.info("Cleaning up history manager...")
         
-        # Close database connection
+        # Let a running export finish
+        if self._io_executor:
+            self._io_executor.shutdown(wait=True)
+            self._io_executor = None
+        
+        # Save pending visits
+        if self.db_conn:
+            self.flush()
+        
+        # Close database connection, refreshing planner statistics first;
+        # closing the writer last checkpoints the WAL
+        self._read_pool.close()
         if self.db_conn:
+            self.db_conn.execute("PRAGMA optimize")
             self.db_conn.close()
             self.db_conn = None
         
@@ -70,6 +129,20 @@ class HistoryManager(QObject):
         
         return True
     
+    @staticmethod
+    def _rows_to_entries(cursor):
+        """Convert history rows to dictionaries straight from the cursor."""
+        return [
+            {
+                "id": entry_id,
+                "url": url,
+                "title": title,
+                "timestamp": visit_time,
+                "visit_count": visit_count
+            }
+            for entry_id, url, title, visit_time, visit_count in cursor
+        ]
+    
     def _create_tables(self):
         """Create database tables."""
         # Create cursor
@@ -86,18 +159,89 @@ class HistoryManager(QObject):
         )
         """)
         
-        # Create index on url
-        cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_history_url ON history (url)
-        """)
+        # Create unique index on url, so a visit is recorded with a single upsert
+        indexes = {row[1]: row[2] for row in cursor.execute("PRAGMA index_list(history)")}
+        if not indexes.get("idx_history_url"):
+            # Merge duplicate entries left by older versions into the newest one
+            cursor.execute("""
+            UPDATE history
+            SET visit_count = (SELECT SUM(h.visit_count) FROM history h WHERE h.url = history.url),
+                visit_time = (SELECT MAX(h.visit_time) FROM history h WHERE h.url = history.url)
+            WHERE id IN (SELECT MAX(id) FROM history GROUP BY url HAVING COUNT(*) > 1)
+            """)
+            cursor.execute("""
+            DELETE FROM history WHERE id NOT IN (SELECT MAX(id) FROM history GROUP BY url)
+            """)
+            cursor.execute("DROP INDEX IF EXISTS idx_history_url")
+            cursor.execute("""
+            CREATE UNIQUE INDEX idx_history_url ON history (url)
+            """)
         
         # Create index on visit_time
         cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_history_visit_time ON history (visit_time)
         """)
         
+        # Create index on visit_count, so get_most_visited needn't sort the table
+        cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_history_visit_count ON history (visit_count)
+        """)
+        
         # Commit changes
         self.db_conn.commit()
+        
+        # Create full-text index for search
+        self._create_search_index()
+    
+    def _create_search_index(self):
+        """Create the trigram full-text index used by search_history."""
+        try:
+            exists = self.db_conn.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history_fts'
+            """).fetchone() is not None
+            
+            # The trigram tokenizer keeps substring semantics of LIKE '%q%'
+            self.db_conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+                url, title, content='history', content_rowid='id', tokenize='trigram'
+            )
+            """)
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5 or older than 3.34
+            self.app_controller.logger.warning(f"History full-text search unavailable: {e}")
+            self._fts_enabled = False
+            return
+        
+        # Keep the index in sync with the history table; repeat visits
+        # only reindex the entry when its title changed
+        self.db_conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS history_fts_ai AFTER INSERT ON history BEGIN
+            INSERT INTO history_fts (rowid, url, title) VALUES (new.id, new.url, new.title);
+        END
+        """)
+        self.db_conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS history_fts_ad AFTER DELETE ON history BEGIN
+            INSERT INTO history_fts (history_fts, rowid, url, title) VALUES ('delete', old.id, old.url, old.title);
+        END
+        """)
+        self.db_conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS history_fts_au AFTER UPDATE OF url, title ON history
+        WHEN old.url IS NOT new.url OR old.title IS NOT new.title BEGIN
+            INSERT INTO history_fts (history_fts, rowid, url, title) VALUES ('delete', old.id, old.url, old.title);
+            INSERT INTO history_fts (rowid, url, title) VALUES (new.id, new.url, new.title);
+        END
+        """)
+        
+        # Index history stored before the index existed
+        if not exists:
+            self.db_conn.execute("""
+            INSERT INTO history_fts (history_fts) VALUES ('rebuild')
+            """)
+        
+        # Commit changes
+        self.db_conn.commit()
+        
+        self._fts_enabled = True
     
     def add_history(self, url, title):
         """Add a history entry."""
@@ -106,37 +250,17 @@ class HistoryManager(QObject):
             return True
         
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
             # Get current time
             current_time = int(time.time())
             
-            # Check if URL exists
-            cursor.execute("""
-            SELECT id, visit_count FROM history WHERE url = ?
-            """, (url,))
-            
-            result = cursor.fetchone()
-            
-            if result:
-                # Update existing entry
-                entry_id, visit_count = result
-                
-                cursor.execute("""
-                UPDATE history
-                SET title = ?, visit_time = ?, visit_count = ?
-                WHERE id = ?
-                """, (title, current_time, visit_count + 1, entry_id))
-            else:
-                # Add new entry
-                cursor.execute("""
-                INSERT INTO history (url, title, visit_time)
-                VALUES (?, ?, ?)
-                """, (url, title, current_time))
-            
-            # Commit changes
-            self.db_conn.commit()
+            # Queue the visit; an isolated visit is written right away,
+            # a burst of visits is written together after the flush delay
+            self._pending_visits.append((url, title, current_time))
+            if time.monotonic() - self._last_flush >= self._flush_delay / 1000:
+                if not self.flush():
+                    return False
+            elif len(self._pending_visits) == 1:
+                QTimer.singleShot(self._flush_delay, self.flush)
             
             # Emit signal
             self.history_added.emit(url, title)
@@ -152,9 +276,29 @@ class HistoryManager(QObject):
             self.app_controller.logger.error(f"Error adding history entry: {e}")
             return False
     
+    def flush(self):
+        """Write pending visits in a single transaction."""
+        if not self._pending_visits or not self.db_conn:
+            return True
+        
+        visits, self._pending_visits = self._pending_visits, []
+        self._last_flush = time.monotonic()
+        try:
+            with self.db_conn:
+                self.db_conn.executemany(self._UPSERT_SQL, visits)
+            
+            return True
+        
+        except Exception as e:
+            self.app_controller.logger.error(f"Error adding history entry: {e}")
+            return False
+    
     def remove_history(self, url):
         """Remove a history entry."""
         try:
+            # Save pending visits first, so none of them brings the entry back
+            self.flush()
+            
             # Create cursor
             cursor = self.db_conn.cursor()
             
@@ -183,6 +327,9 @@ class HistoryManager(QObject):
     def clear_history(self):
         """Clear all history."""
         try:
+            # Pending visits would be deleted anyway
+            self._pending_visits.clear()
+            
             # Create cursor
             cursor = self.db_conn.cursor()
             
@@ -211,31 +358,21 @@ class HistoryManager(QObject):
     def get_history(self, limit=100, offset=0):
         """Get history entries."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
+            # Include pending visits
+            self.flush()
             
             # Get history
-            cursor.execute(
-                """
-            SELECT id, url, title, visit_time, visit_count
-            FROM history
-            ORDER BY visit_time DESC
-            LIMIT ? OFFSET ?
-            """,
-                (limit, offset),
-            )
-            
-            # Convert to list of dictionaries
-            history = []
-            for row in cursor.fetchall():
-                entry_id, url, title, visit_time, visit_count = row
-                history.append({
-                    "id": entry_id,
-                    "url": url,
-                    "title": title,
-                    "timestamp": visit_time,
-                    "visit_count": visit_count
-                })
+            with self._read_pool.connection() as conn:
+                cursor = conn.execute(
+                    """
+                SELECT id, url, title, visit_time, visit_count
+                FROM history
+                ORDER BY visit_time DESC
+                LIMIT ? OFFSET ?
+                """,
+                    (limit, offset),
+                )
+                history = self._rows_to_entries(cursor)
             
             return history
         
@@ -246,32 +383,35 @@ class HistoryManager(QObject):
     def search_history(self, query, limit=100, offset=0):
         """Search history entries."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
-            
-            # Search history
-            cursor.execute(
-                """
-            SELECT id, url, title, visit_time, visit_count
-            FROM history
-            WHERE url LIKE ? OR title LIKE ?
-            ORDER BY visit_time DESC
-            LIMIT ? OFFSET ?
-            """,
-                (f"%{query}%", f"%{query}%", limit, offset),
-            )
-            
-            # Convert to list of dictionaries
-            history = []
-            for row in cursor.fetchall():
-                entry_id, url, title, visit_time, visit_count = row
-                history.append({
-                    "id": entry_id,
-                    "url": url,
-                    "title": title,
-                    "timestamp": visit_time,
-                    "visit_count": visit_count
-                })
+            # Include pending visits
+            self.flush()
+            
+            # Search history; trigrams need at least three characters
+            with self._read_pool.connection() as conn:
+                if self._fts_enabled and len(query) >= 3:
+                    cursor = conn.execute(
+                        """
+                    SELECT h.id, h.url, h.title, h.visit_time, h.visit_count
+                    FROM history_fts
+                    JOIN history h ON h.id = history_fts.rowid
+                    WHERE history_fts MATCH ?
+                    ORDER BY h.visit_time DESC
+                    LIMIT ? OFFSET ?
+                    """,
+                        ('"' + query.replace('"', '""') + '"', limit, offset),
+                    )
+                else:
+                    cursor = conn.execute(
+                        """
+                    SELECT id, url, title, visit_time, visit_count
+                    FROM history
+                    WHERE url LIKE ? OR title LIKE ?
+                    ORDER BY visit_time DESC
+                    LIMIT ? OFFSET ?
+                    """,
+                        (f"%{query}%", f"%{query}%", limit, offset),
+                    )
+                history = self._rows_to_entries(cursor)
             
             return history
         
@@ -282,31 +422,21 @@ class HistoryManager(QObject):
     def get_most_visited(self, limit=10):
         """Get most visited sites."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
+            # Include pending visits
+            self.flush()
             
             # Get most visited sites
-            cursor.execute(
-                """
-            SELECT id, url, title, visit_time, visit_count
-            FROM history
-            ORDER BY visit_count DESC
-            LIMIT ?
-            """,
-                (limit,),
-            )
-            
-            # Convert to list of dictionaries
-            history = []
-            for row in cursor.fetchall():
-                entry_id, url, title, visit_time, visit_count = row
-                history.append({
-                    "id": entry_id,
-                    "url": url,
-                    "title": title,
-                    "timestamp": visit_time,
-                    "visit_count": visit_count
-                })
+            with self._read_pool.connection() as conn:
+                cursor = conn.execute(
+                    """
+                SELECT id, url, title, visit_time, visit_count
+                FROM history
+                ORDER BY visit_count DESC
+                LIMIT ?
+                """,
+                    (limit,),
+                )
+                history = self._rows_to_entries(cursor)
             
             return history
         
@@ -317,31 +447,21 @@ class HistoryManager(QObject):
     def get_recent(self, limit=10):
         """Get recently visited sites."""
         try:
-            # Create cursor
-            cursor = self.db_conn.cursor()
+            # Include pending visits
+            self.flush()
             
             # Get recent sites
-            cursor.execute(
-                """
-            SELECT id, url, title, visit_time, visit_count
-            FROM history
-            ORDER BY visit_time DESC
-            LIMIT ?
-            """,
-                (limit,),
-            )
-            
-            # Convert to list of dictionaries
-            history = []
-            for row in cursor.fetchall():
-                entry_id, url, title, visit_time, visit_count = row
-                history.append({
-                    "id": entry_id,
-                    "url": url,
-                    "title": title,
-                    "timestamp": visit_time,
-                    "visit_count": visit_count
-                })
+            with self._read_pool.connection() as conn:
+                cursor = conn.execute(
+                    """
+                SELECT id, url, title, visit_time, visit_count
+                FROM history
+                ORDER BY visit_time DESC
+                LIMIT ?
+                """,
+                    (limit,),
+                )
+                history = self._rows_to_entries(cursor)
             
             return history
         
@@ -350,16 +470,42 @@ class HistoryManager(QObject):
             return []
     
     def export_history(self, file_path):
+        """Export history to a file."""
+        # Include pending visits
+        self.flush()
+        
+        return self._export_history(file_path)
+    
+    def export_history_async(self, file_path):
+        """
+        Export history to a file on the I/O worker thread.
+        Returns a Future that resolves to True on success.
+        """
+        # Include pending visits
+        self.flush()
+        
+        return self._io_executor.submit(self._export_history, file_path)
+    
+    def _export_history(self, file_path):
         """Export history to a file."""
         try:
-            # Get all history
-            history = self.get_history(limit=0)
-            
             # Check file extension
             if file_path.endswith(".json"):
-                # Export to JSON
-                with open(file_path, "w") as f:
-                    json.dump(history, f, indent=4)
+                # Export to JSON, streaming entries straight from the cursor
+                with open(file_path, "wb") as f:
+                    f.write(b"[\n")
+                    for i, row in enumerate(self._iter_history()):
+                        entry_id, url, title, visit_time, visit_count = row
+                        if i:
+                            f.write(b",\n")
+                        f.write(json_dumps({
+                            "id": entry_id,
+                            "url": url,
+                            "title": title,
+                            "timestamp": visit_time,
+                            "visit_count": visit_count
+                        }))
+                    f.write(b"\n]\n")
             
             elif file_path.endswith(".csv"):
                 # Export to CSV
@@ -372,36 +518,53 @@ class HistoryManager(QObject):
                     writer.writerow(["URL", "Title", "Visit Time", "Visit Count"])
                     
                     # Write data
-                    for entry in history:
-                        writer.writerow([
-                            entry["url"],
-                            entry["title"],
-                            entry["timestamp"],
-                            entry["visit_count"],
-                        ])
+                    writer.writerows(row[1:] for row in self._iter_history())
             
             else:
                 self.app_controller.logger.error("Unsupported history file format")
                 return False
             
-            # Trigger hook
-            self.app_controller.hook_registry.trigger_hook("onHistoryExported")
-            
             self.app_controller.logger.info(f"History exported to {file_path}")
             
+            # Emit signal
+            self.history_exported.emit()
+            
             return True
         
         except Exception as e:
             self.app_controller.logger.error(f"Error exporting history: {e}")
             return False
     
+    def _iter_history(self, batch_size=1000):
+        """Yield every history row, newest first, without loading them all."""
+        with self._read_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = batch_size
+            cursor.execute(
+                """
+            SELECT id, url, title, visit_time, visit_count
+            FROM history
+            ORDER BY visit_time DESC
+            """
+            )
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return
+                yield from rows
+    
+    def _on_history_exported(self):
+        """Trigger the export hook on the manager's thread."""
+        self.app_controller.hook_registry.trigger_hook("onHistoryExported")
+    
     def import_history(self, file_path):
         """Import history from a file."""
         try:
             # Check file extension
             if file_path.endswith(".json"):
                 # Import from JSON
-                with open(file_path, "r") as f:
+                # Read bytes; exports are UTF-8 whatever the locale
+                with open(file_path, "rb") as f:
                     data = json.load(f)
                 
                 # Check if data is valid
@@ -410,9 +573,8 @@ class HistoryManager(QObject):
                     return False
                 
                 # Import history
-                for entry in data:
-                    if "url" in entry and "title" in entry:
-                        self.add_history(entry["url"], entry["title"])
+                self._import_entries((entry["url"], entry["title"]) for entry in data
+                                     if "url" in entry and "title" in entry)
             
             elif file_path.endswith(".csv"):
                 # Import from CSV
@@ -425,10 +587,7 @@ class HistoryManager(QObject):
                     next(reader)
                     
                     # Import history
-                    for row in reader:
-                        if len(row) >= 2:
-                            url, title = row[0], row[1]
-                            self.add_history(url, title)
+                    self._import_entries((row[0], row[1]) for row in reader if len(row) >= 2)
             
             else:
                 self.app_controller.logger.error("Unsupported history file format")
@@ -445,6 +604,18 @@ class HistoryManager(QObject):
             self.app_controller.logger.error(f"Error importing history: {e}")
             return False
     
+    def _import_entries(self, entries):
+        """Add (url, title) entries in a single transaction."""
+        # Skip if in private mode, as add_history does
+        if self.private_mode:
+            return
+        
+        current_time = int(time.time())
+        with self.db_conn:
+            self.db_conn.executemany(
+                self._UPSERT_SQL, ((url, title, current_time) for url, title in entries)
+            )
+    
     def set_private_mode(self, enabled):
         """Set private browsing mode."""
         self.private_mode = enabled
@@ -6,7 +6,43 @@ import json
 import time
 import hashlib
 import sqlite3
+from collections import OrderedDict
 from PyQt6.QtCore import QObject, pyqtSignal
+from src.utils.sqlite_utils import ReadConnectionPool, configure_connection
+
+
+class _LRUCache:
+    """
+    Small least-recently-used cache keyed by URL.
+    """
+
+    def __init__(self, maxsize):
+        """Initialize an empty cache holding at most maxsize entries."""
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss."""
+        try:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        except KeyError:
+            pass
+
+        # Exceptions from compute propagate without caching anything
+        value = compute(key)
+        self._entries[key] = value
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return value
+
+    def pop(self, key, default=None):
+        """Remove key from the cache."""
+        return self._entries.pop(key, default)
+
+    def clear(self):
+        """Remove every entry."""
+        self._entries.clear()
 
 
 class SecurityManager(QObject):
@@ -29,6 +65,9 @@ class SecurityManager(QObject):
         self.conn = None
         self.cursor = None
 
+        # Read-only connections for query methods
+        self._read_pool = ReadConnectionPool()
+
         # Security settings
         self.security_settings = {
             "block_malicious_sites": True,
@@ -55,15 +94,22 @@ class SecurityManager(QObject):
             "exploit",
         ]
 
+        # Per-URL results, since the same URLs are checked for every subresource
+        self._blocked_cache = _LRUCache(4096)
+        self._security_cache = _LRUCache(4096)
+
     def initialize(self):
         """Initialize the security manager."""
         # Create security directory if it doesn't exist
         os.makedirs(os.path.dirname(self.security_db), exist_ok=True)
 
         # Connect to database
-        self.conn = sqlite3.connect(self.security_db)
+        self.conn = sqlite3.connect(self.security_db, check_same_thread=False)
         self.cursor = self.conn.cursor()
 
+        # Use WAL, with the journal and cache settings shared by the manager databases
+        configure_connection(self.conn)
+
         # Create tables if they don't exist
         self.cursor.execute(
             """
@@ -90,21 +136,29 @@ class SecurityManager(QObject):
         )
 
         # Create indexes
+        # Filtering by type also returns events newest first straight from the index
+        self.cursor.execute("DROP INDEX IF EXISTS idx_security_events_type")
         self.cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_security_events_type ON security_events (event_type)"
+            "CREATE INDEX IF NOT EXISTS idx_security_events_type_timestamp "
+            "ON security_events (event_type, timestamp)"
         )
         self.cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_security_events_timestamp ON security_events (timestamp)"
         )
-        self.cursor.execute(
-            "CREATE INDEX IF NOT EXISTS idx_blocked_sites_url ON blocked_sites (url)"
-        )
+        # blocked_sites.url is UNIQUE, so SQLite already indexes it
+        self.cursor.execute("DROP INDEX IF EXISTS idx_blocked_sites_url")
 
         # Commit changes
         self.conn.commit()
 
-        # Load security settings
+        # Open read-only connections; WAL lets them read while events are logged
+        self._read_pool.open(self.security_db)
+
+        # Load security settings once, then follow individual changes
         self.load_security_settings()
+        self.app_controller.settings_manager.setting_changed.connect(
+            self._on_setting_changed
+        )
 
     def load_security_settings(self):
         """Load security settings from settings manager."""
@@ -124,17 +178,37 @@ class SecurityManager(QObject):
             )
             self.security_settings["plugin_resource_limits"][key] = value
 
+    def _on_setting_changed(self, key, value):
+        """Update the changed security setting without reloading the rest."""
+        if not key.startswith("security_"):
+            return
+
+        name = key[len("security_") :]
+        limits = self.security_settings["plugin_resource_limits"]
+        if name.startswith("plugin_") and name[len("plugin_") :] in limits:
+            limits[name[len("plugin_") :]] = value
+        elif name in self.security_settings and name != "plugin_resource_limits":
+            self.security_settings[name] = value
+
     def check_url_security(self, url):
         """Check if a URL is secure."""
+        # Copy so callers can't modify the cached status
+        return dict(
+            self._security_cache.get_or_compute(url, self._compute_url_security)
+        )
+
+    def _compute_url_security(self, url):
+        """Compute the security status of a URL."""
         # Check if URL is HTTPS
         is_https = url.startswith("https://")
 
         # Check if URL is in blocked sites
         is_blocked = self.is_url_blocked(url)
 
-        # Check for malicious indicators
+        # Check for malicious indicators, lowercasing the URL once
+        url_lower = url.lower()
         has_malicious_indicators = any(
-            indicator in url.lower() for indicator in self.malicious_indicators
+            indicator in url_lower for indicator in self.malicious_indicators
         )
 
         # Return security status
@@ -148,16 +222,25 @@ class SecurityManager(QObject):
     def is_url_blocked(self, url):
         """Check if a URL is blocked."""
         try:
-            # Check database
-            self.cursor.execute("SELECT id FROM blocked_sites WHERE url = ?", (url,))
-            result = self.cursor.fetchone()
-
-            return result is not None
+            return self._blocked_cache.get_or_compute(url, self._is_url_blocked_db)
 
         except Exception as e:
             print(f"Error checking blocked URL: {e}")
             return False
 
+    def _is_url_blocked_db(self, url):
+        """Check the database for a blocked URL."""
+        with self._read_pool.connection() as conn:
+            row = conn.execute(
+                "SELECT id FROM blocked_sites WHERE url = ?", (url,)
+            ).fetchone()
+        return row is not None
+
+    def _invalidate_url(self, url):
+        """Drop cached results for a URL whose blocked state changed."""
+        self._blocked_cache.pop(url)
+        self._security_cache.pop(url)
+
     def block_url(self, url, reason):
         """Block a URL."""
         try:
@@ -173,6 +256,7 @@ class SecurityManager(QObject):
 
             # Commit changes
             self.conn.commit()
+            self._invalidate_url(url)
 
             # Log security event
             self.log_security_event("url_blocked", url, f"URL blocked: {reason}", 2)
@@ -193,6 +277,7 @@ class SecurityManager(QObject):
 
             # Commit changes
             self.conn.commit()
+            self._invalidate_url(url)
 
             # Log security event
             self.log_security_event("url_unblocked", url, "URL unblocked", 1)
@@ -208,16 +293,14 @@ class SecurityManager(QObject):
     def get_blocked_urls(self):
         """Get blocked URLs."""
         try:
-            # Get blocked sites
-            self.cursor.execute(
-                "SELECT url, reason, timestamp FROM blocked_sites ORDER BY timestamp DESC"
-            )
-
-            # Return results
-            return [
-                {"url": row[0], "reason": row[1], "timestamp": row[2]}
-                for row in self.cursor.fetchall()
-            ]
+            # Get blocked sites, building results straight from the cursor
+            with self._read_pool.connection() as conn:
+                return [
+                    {"url": url, "reason": reason, "timestamp": timestamp}
+                    for url, reason, timestamp in conn.execute(
+                        "SELECT url, reason, timestamp FROM blocked_sites ORDER BY timestamp DESC"
+                    )
+                ]
 
         except Exception as e:
             print(f"Error getting blocked URLs: {e}")
@@ -275,20 +358,20 @@ class SecurityManager(QObject):
             query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
             params.extend([limit, offset])
 
-            # Execute query
-            self.cursor.execute(query, params)
-
-            # Return results
-            return [
-                {
-                    "event_type": row[0],
-                    "url": row[1],
-                    "description": row[2],
-                    "severity": row[3],
-                    "timestamp": row[4],
-                }
-                for row in self.cursor.fetchall()
-            ]
+            # Execute query, building results straight from the cursor
+            with self._read_pool.connection() as conn:
+                return [
+                    {
+                        "event_type": event_type,
+                        "url": url,
+                        "description": description,
+                        "severity": severity,
+                        "timestamp": timestamp,
+                    }
+                    for event_type, url, description, severity, timestamp in conn.execute(
+                        query, params
+                    )
+                ]
 
         except Exception as e:
             print(f"Error getting security events: {e}")
@@ -355,6 +438,9 @@ class SecurityManager(QObject):
         except Exception as e:
             return False, f"Error verifying plugin integrity: {e}"
 
+    # Read size used when hashing plugin files
+    _HASH_CHUNK_SIZE = 1 << 20
+
     def calculate_plugin_hash(self, plugin_path):
         """Calculate plugin hash."""
         try:
@@ -363,16 +449,20 @@ class SecurityManager(QObject):
 
             # Get all files in plugin directory
             for root, dirs, files in os.walk(plugin_path):
-                for file in sorted(files):
-                    file_path = os.path.join(root, file)
+                # Don't descend into __pycache__ at all
+                dirs[:] = [d for d in dirs if d != "__pycache__"]
 
-                    # Skip __pycache__ and other non-source files
-                    if "__pycache__" in file_path or file.endswith(".pyc"):
+                for file in sorted(files):
+                    # Skip compiled files outside __pycache__
+                    if file.endswith(".pyc"):
                         continue
 
-                    # Read file and update hash
+                    file_path = os.path.join(root, file)
+
+                    # Hash the file in fixed-size chunks to bound memory
                     with open(file_path, "rb") as f:
-                        hasher.update(f.read())
+                        for chunk in iter(lambda: f.read(self._HASH_CHUNK_SIZE), b""):
+                            hasher.update(chunk)
 
             # Return hash
             return hasher.hexdigest()
@@ -393,8 +483,14 @@ class SecurityManager(QObject):
 
         return True, "Plugin permissions verified"
 
+    def cleanup(self):
+        """Clean up the security manager, as the other managers do."""
+        self.shutdown()
+        return True
+
     def shutdown(self):
         """Shutdown the security manager."""
-        # Close database connection
+        # Close database connection; closing the writer last checkpoints the WAL
+        self._read_pool.close()
         if self.conn:
             self.conn.close()
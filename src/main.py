@@ -3,11 +3,17 @@
 
 import os
 import sys
+import asyncio
 import logging
 import traceback
 from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtCore import QUrl
 
+try:
+    import qasync
+except ImportError:  # Optional: asyncio integration for plugins
+    qasync = None
+
 # Add parent directory to path
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root)
@@ -26,6 +32,21 @@ def setup_logging():
     os.makedirs(log_dir, exist_ok=True)
 
 
+def install_event_loop(app):
+    """Run asyncio on the Qt event loop when qasync is available."""
+    if qasync is None:
+        return None
+
+    # The proactor loop qasync uses by default on Windows does not support
+    # every asyncio primitive plugins rely on, so use the selector loop.
+    if os.name == "nt":
+        loop = qasync.QSelectorEventLoop(app)
+    else:
+        loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    return loop
+
+
 def global_exception_hook(exctype, value, tb):
     """Global exception handler to log uncaught exceptions and show a dialog."""
     error_msg = ''.join(traceback.format_exception(exctype, value, tb))
@@ -57,16 +78,26 @@ def main():
     app.setOrganizationName("NebulaFusion")
     app.setOrganizationDomain("nebulafusion.io")
 
+    # Let plugins schedule coroutines without nested event loops
+    loop = install_event_loop(app)
+
     # Create application controller
     app_controller = Application()
 
     # Initialize application
-    app_controller.initialize()
+    if not app_controller.initialize():
+        sys.exit(1)
+
+    # Shut managers down, flushing pending writes, when the event loop ends
+    app.aboutToQuit.connect(app_controller.cleanup)
 
     # Show main window
     app_controller.show()
 
     # Start application
+    if loop is not None:
+        with loop:
+            sys.exit(loop.run_forever())
     sys.exit(app.exec())
 
 
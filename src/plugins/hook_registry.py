@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 # NebulaFusion Browser - Hook Registry
 
+import threading
+from collections import deque
 from PyQt6.QtCore import QObject, pyqtSignal
 
 
@@ -23,6 +25,13 @@ class HookRegistry(QObject):
         # Hooks
         self._hooks = {}
 
+        # Guards the hook table; download worker threads trigger hooks while
+        # plugins register and unregister them on the GUI thread
+        self._lock = threading.RLock()
+
+        # Reusable callback snapshot lists for trigger_hook
+        self._snapshot_pool = deque(maxlen=64)
+
         # Available hooks
         self.available_hooks = [
             # Browser lifecycle hooks
@@ -111,7 +120,8 @@ class HookRegistry(QObject):
             return False
 
         # Register hook
-        self.hooks[hook_name][plugin_id] = callback
+        with self._lock:
+            self.hooks[hook_name][plugin_id] = callback
 
         # Emit signal
         self.hook_registered.emit(hook_name, plugin_id)
@@ -127,15 +137,16 @@ class HookRegistry(QObject):
             self.app_controller.logger.warning(f"Hook not found: {hook_name}")
             return False
 
-        # Check if plugin has registered this hook
-        if plugin_id not in self.hooks[hook_name]:
-            self.app_controller.logger.warning(
-                f"Plugin has not registered hook: {hook_name}"
-            )
-            return False
+        with self._lock:
+            # Check if plugin has registered this hook
+            if plugin_id not in self.hooks[hook_name]:
+                self.app_controller.logger.warning(
+                    f"Plugin has not registered hook: {hook_name}"
+                )
+                return False
 
-        # Unregister hook
-        del self.hooks[hook_name][plugin_id]
+            # Unregister hook
+            del self.hooks[hook_name][plugin_id]
 
         # Emit signal
         self.hook_unregistered.emit(hook_name, plugin_id)
@@ -160,7 +171,30 @@ class HookRegistry(QObject):
 
         self.app_controller.logger.info(f"Triggering hook: {hook_name}")
 
-        for plugin_id, callback in list(self._hooks[hook_name].items()):
+        callbacks = self._acquire_snapshot()
+        with self._lock:
+            callbacks.extend(self._hooks[hook_name].items())
+
+        try:
+            self._dispatch(hook_name, callbacks, args, kwargs)
+        finally:
+            self._release_snapshot(callbacks)
+
+    def _acquire_snapshot(self):
+        """Take an empty dispatch list from the pool, or create one."""
+        try:
+            return self._snapshot_pool.pop()
+        except IndexError:
+            return []
+
+    def _release_snapshot(self, snapshot):
+        """Clear a dispatch list and return it to the pool."""
+        snapshot.clear()
+        self._snapshot_pool.append(snapshot)
+
+    def _dispatch(self, hook_name, callbacks, args, kwargs):
+        """Invoke a snapshot of hook callbacks."""
+        for plugin_id, callback in callbacks:
             try:
                 callback(*args, **kwargs)
             except Exception as e:
@@ -6,6 +6,7 @@ import sys
 import shutil
 import zipfile
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtCore import QObject, pyqtSignal
 import json
 
@@ -73,6 +74,20 @@ class PluginManager(QObject):
 
         self.app_controller.logger.info("Plugin manager initialized.")
 
+    def cleanup(self):
+        """Clean up the plugin manager."""
+        self.app_controller.logger.info("Cleaning up plugin manager...")
+
+        # Deactivate enabled plugins, most recently loaded first
+        plugin_loader = self.app_controller.plugin_loader
+        for plugin_id, plugin in reversed(list(plugin_loader.loaded_plugins.items())):
+            if plugin["enabled"]:
+                self.disable_plugin(plugin_id)
+
+        self.app_controller.logger.info("Plugin manager cleaned up.")
+
+        return True
+
     def _load_plugins(self):
         """Load plugins from plugin directories."""
         self.app_controller.logger.info("Loading plugins...")
@@ -81,6 +96,8 @@ class PluginManager(QObject):
             set()
         )  # Keep track of IDs loaded in this session to avoid conflicts
 
+        # Collect candidate plugin directories from every root
+        candidate_paths = []
         for plugin_dir_root in self.plugin_dirs:
             if not os.path.exists(plugin_dir_root):
                 self.app_controller.logger.warning(
@@ -101,61 +118,80 @@ class PluginManager(QObject):
 
             # Also check the root directory for direct plugin files
             potential_plugins.append(plugin_dir_root)
+            candidate_paths.extend(potential_plugins)
 
-            for potential_plugin_path in potential_plugins:
-                # Check for manifest.json to get plugin_id
-                manifest_path = os.path.join(potential_plugin_path, "manifest.json")
-                init_path = os.path.join(potential_plugin_path, "__init__.py")
+        if not candidate_paths:
+            return
 
-                self.app_controller.logger.debug(
-                    f"Checking potential plugin at: {potential_plugin_path}"
-                )
+        # Read manifests concurrently; importing and instantiating plugins
+        # stays on this thread, in directory order
+        with ThreadPoolExecutor(max_workers=min(8, len(candidate_paths))) as executor:
+            manifest_futures = [
+                executor.submit(self._read_manifest, path) for path in candidate_paths
+            ]
 
-                if os.path.exists(manifest_path) and os.path.exists(init_path):
-                    try:
-                        with open(manifest_path, "r", encoding="utf-8") as f:
-                            manifest = json.load(f)
-                        plugin_id = manifest.get("id")
+        for potential_plugin_path, manifest_future in zip(
+            candidate_paths, manifest_futures
+        ):
+            self.app_controller.logger.debug(
+                f"Checking potential plugin at: {potential_plugin_path}"
+            )
 
-                        if not plugin_id:
-                            self.app_controller.logger.warning(
-                                f"Plugin at {potential_plugin_path} has no ID in manifest"
-                            )
-                            continue
+            try:
+                manifest = manifest_future.result()
+                if manifest is None:
+                    continue
 
-                        self.app_controller.logger.info(
-                            f"Found plugin: {plugin_id} at {potential_plugin_path}"
-                        )
+                plugin_id = manifest.get("id")
 
-                        if plugin_id not in loaded_plugin_ids:
-                            actual_plugin_id_loaded = plugin_loader.load_plugin(
-                                potential_plugin_path
-                            )
-                            if (
-                                actual_plugin_id_loaded
-                            ):  # load_plugin returns ID on success
-                                loaded_plugin_ids.add(actual_plugin_id_loaded)
-                                self.app_controller.logger.info(
-                                    f"Successfully loaded plugin: {plugin_id}"
-                                )
-                            else:
-                                self.app_controller.logger.error(
-                                    f"Failed to load plugin: {plugin_id}"
-                                )
-                        else:
-                            self.app_controller.logger.info(
-                                f"Plugin '{plugin_id}' already processed in this session. Skipping {potential_plugin_path}"
-                            )
-
-                    except json.JSONDecodeError as e:
-                        self.app_controller.logger.error(
-                            f"Could not decode manifest.json in {potential_plugin_path}: {str(e)}"
+                if not plugin_id:
+                    self.app_controller.logger.warning(
+                        f"Plugin at {potential_plugin_path} has no ID in manifest"
+                    )
+                    continue
+
+                self.app_controller.logger.info(
+                    f"Found plugin: {plugin_id} at {potential_plugin_path}"
+                )
+
+                if plugin_id not in loaded_plugin_ids:
+                    actual_plugin_id_loaded = plugin_loader.load_plugin(
+                        potential_plugin_path
+                    )
+                    if actual_plugin_id_loaded:  # load_plugin returns ID on success
+                        loaded_plugin_ids.add(actual_plugin_id_loaded)
+                        self.app_controller.logger.info(
+                            f"Successfully loaded plugin: {plugin_id}"
                         )
-                    except Exception as e:
+                    else:
                         self.app_controller.logger.error(
-                            f"Error loading plugin at {potential_plugin_path}: {str(e)}",
-                            exc_info=True,
+                            f"Failed to load plugin: {plugin_id}"
                         )
+                else:
+                    self.app_controller.logger.info(
+                        f"Plugin '{plugin_id}' already processed in this session. Skipping {potential_plugin_path}"
+                    )
+
+            except json.JSONDecodeError as e:
+                self.app_controller.logger.error(
+                    f"Could not decode manifest.json in {potential_plugin_path}: {str(e)}"
+                )
+            except Exception as e:
+                self.app_controller.logger.error(
+                    f"Error loading plugin at {potential_plugin_path}: {str(e)}",
+                    exc_info=True,
+                )
+
+    @staticmethod
+    def _read_manifest(plugin_path):
+        """Read a candidate's manifest, or return None if it isn't a plugin."""
+        manifest_path = os.path.join(plugin_path, "manifest.json")
+        init_path = os.path.join(plugin_path, "__init__.py")
+        if not (os.path.exists(manifest_path) and os.path.exists(init_path)):
+            return None
+
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f)
 
     def _load_store_plugins(self):
         """Load store plugins."""
@@ -398,9 +398,10 @@ class DownloadsDialog(QDialog):
         
         if result == QMessageBox.StandardButton.Yes:
             # Remove downloads
-            for row in sorted(selected_rows, reverse=True):
-                download_id = self.downloads_table.item(row, 0).data(Qt.ItemDataRole.UserRole)
-                self.app_controller.download_manager.remove_download(download_id)
+            rows = sorted(selected_rows, reverse=True)
+            download_ids = [self.downloads_table.item(row, 0).data(Qt.ItemDataRole.UserRole) for row in rows]
+            self.app_controller.download_manager.remove_downloads(download_ids)
+            for row in rows:
                 self.downloads_table.removeRow(row)
     
     def _on_clear_completed(self):
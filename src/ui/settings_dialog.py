@@ -472,7 +472,7 @@ class SettingsDialog(QDialog):
 
     def _load_settings(self):
         """Load settings from settings manager."""
-        settings = self.app_controller.settings_manager.default_settings
+        settings = self.app_controller.settings_manager.get_all_settings()
 
         # General settings
         self.home_page_edit.setText(settings.get("home_page", ""))
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# NebulaFusion Browser - JSON Utilities
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encoding and decoding
+    orjson = None
+
+def json_dumps(obj):
+    """Encode an object as JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+def json_loads(data):
+    """Decode JSON bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# NebulaFusion Browser - SQLite Utilities
+
+import queue
+import sqlite3
+from contextlib import contextmanager
+
+# Memory-mapped I/O size for databases read often enough to benefit (256 MiB)
+MMAP_SIZE = 268435456
+
+def configure_connection(conn, mmap_size=None):
+    """Apply the journal and cache PRAGMAs shared by the manager databases."""
+    # Use WAL so readers never block the writer and each commit needs a single fsync
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA busy_timeout=5000")
+    if mmap_size:
+        conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+
+class ReadConnectionPool:
+    """
+    Pool of read-only connections for query methods.
+    With the database in WAL mode, pooled readers run alongside the writer.
+    Borrowing fails fast while the pool is closed, so queries made before
+    initialize or after cleanup raise instead of blocking the caller.
+    """
+    
+    def __init__(self, size=4, timeout=5.0):
+        """Initialize a closed pool of size connections."""
+        self.size = size
+        self.timeout = timeout
+        self._pool = queue.Queue()
+        self._open = False
+    
+    def open(self, db_path, mmap_size=None, row_factory=None):
+        """Open the pooled connections to db_path."""
+        for _ in range(self.size):
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-16000")
+            if mmap_size:
+                conn.execute(f"PRAGMA mmap_size={int(mmap_size)}")
+            if row_factory is not None:
+                conn.row_factory = row_factory
+            self._pool.put(conn)
+        
+        self._open = True
+    
+    def close(self):
+        """Close the pooled connections; borrowed ones close when returned."""
+        self._open = False
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a read-only connection from the pool."""
+        if not self._open:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        
+        try:
+            conn = self._pool.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Timed out waiting for a read connection") from None
+        
+        try:
+            yield conn
+        finally:
+            if self._open:
+                self._pool.put(conn)
+            else:
+                conn.close()